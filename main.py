@@ -1,25 +1,92 @@
-from src.nba_synth import synthesize_quarters
-from src.nba_synth.features import analyze_features
-from src.nba_synth.conjectures import generate_conjectures
+import time
+_START = time.perf_counter()
+
+from src.nba_synth.store import DatasetCache
+from src.nba_synth.layout import drop_quarters
+from src.nba_synth import telemetry
 
-import pandas as pd
-import numpy as np
 import sys
+import argparse
 import questionary
-import pyfiglet
+from functools import lru_cache
 from rich.console import Console
 import utils 
 
+# feature analysis (sklearn) and conjecturing (txgraffiti + LP solvers) are
+# imported inside the menu options that use them, to keep startup fast
+
 console = Console()
+datasets = DatasetCache()
+conjecture_cache = None
+
+
+def get_selector(entry, feats):
+    """Fitted FeatureSelector for these features of a cached dataset, reused across k.
+
+    Selectors live on the dataset entry, so they are dropped when `datasets`
+    evicts or reloads it.
+    """
+    from src.nba_synth.features import FeatureSelector
+
+    key = tuple(feats)
+    if key not in entry.selectors:
+        entry.selectors[key] = FeatureSelector().fit(entry.clean[feats])
+    return entry.selectors[key]
+
+
+def get_conjecture_cache():
+    global conjecture_cache
+    if conjecture_cache is None:
+        from src.nba_synth.conjectures import ConjectureCache
+        conjecture_cache = ConjectureCache()
+    return conjecture_cache
+
+
+@lru_cache(maxsize=None)
+def banner() -> str:
+    """Rendered title, computed once per session."""
+    import pyfiglet
+    return pyfiglet.figlet_format("NBA Insights", font="slant")
+
 
+def startup_time():
+    """Print how long startup takes, and what the deferred imports would cost."""
+    imported = time.perf_counter()
+    banner()
+    ready = time.perf_counter()
+    console.print(f"imports:      {imported - _START:8.3f} s")
+    console.print(f"banner:       {ready - imported:8.3f} s")
+    console.print(f"first menu:   {ready - _START:8.3f} s")
+    for module in ["src.nba_synth.features", "src.nba_synth.conjectures"]:
+        t = time.perf_counter()
+        __import__(module)
+        console.print(f"[dim]deferred {module}: {time.perf_counter() - t:.3f} s[/dim]")
 
-def main_menu():
+
+def report_telemetry(args):
+    """Print and dump the stages recorded during the last menu action (--profile)."""
+    if not telemetry.records:
+        return
+    console.print(telemetry.summary_table())
+    if args.profile_json:
+        telemetry.to_json(args.profile_json)
+        console.print(f"[dim]Stage records written to {args.profile_json}[/dim]")
+    if args.profile_stats:
+        hot = telemetry.dump_pstats(args.profile_stats)
+        if hot:
+            console.print(f"[dim]Profile of '{hot}' written to {args.profile_stats}[/dim]")
+    telemetry.reset()
+
+
+def main_menu(args=None):
     # Automatically create a backup when the app starts.
     # create_backup(console)
     
     while True:
-        title_text = pyfiglet.figlet_format("NBA Insights", font="slant")
-        console.print(title_text, style="bold cyan")
+        if args is not None and args.profile:
+            # reported here so actions that `continue` early are covered too
+            report_telemetry(args)
+        console.print(banner(), style="bold cyan")
         choice = questionary.select(
             "Please select an option:",
             choices=[
@@ -51,11 +118,11 @@ def main_menu():
             ).ask()
             
             if database == "Original games dataset":
-                df = pd.read_csv("data/games.csv")
+                df = datasets.get("data/games.csv").df
                 print("Original games dataset selected.")
             else:
                 try:
-                    df = pd.read_csv("data/synthetic_quarters.csv")
+                    df = datasets.get("data/synthetic_quarters.csv").df
                     print("Synthetic quarterly stats dataset selected.")
                 except FileNotFoundError:
                     console.print("[red]Synthetic quarterly stats dataset not found. Please generate it first.[/red]")
@@ -66,12 +133,14 @@ def main_menu():
             console.print(df.info())  # Display DataFrame info
             
         elif option == 2:
-            df = pd.read_csv("data/games.csv")
+            df = datasets.get("data/games.csv").df
             print("Generating synthetic quarterly stats from original games dataset...")
             
-            df_synth = synthesize_quarters(df)
-            df_synth.to_csv("data/synthetic_quarters.csv", index=False)
-            console.print("Synthetic quarterly stats generated and saved to data/synthetic_quarters.csv")
+            from src.nba_synth.incremental import synthesize_incremental
+
+            # only games not yet in synthetic_quarters.csv are synthesized and appended
+            df_synth = synthesize_incremental(df, output="data/synthetic_quarters.csv")
+            console.print(f"{len(df_synth)} new games synthesized and saved to data/synthetic_quarters.csv")
 
         elif option == 3:
             database = questionary.select(
@@ -84,13 +153,12 @@ def main_menu():
             ).ask()
             
             if database == "Original games dataset":
-                df = pd.read_csv("data/games.csv")
+                entry = datasets.get("data/games.csv")
                 print("Original games dataset selected.")
                 
-                # remove columns with NaN values
-                df = df.dropna(axis=1)
-                
-                feats = [col for col in df.select_dtypes(include=['number']).columns if col not in ['season_id', 'game_id']]
+                # columns with NaN values are already removed in entry.clean
+                df = entry.clean
+                feats = entry.features
                 
                 k = questionary.text(
                     "How many features do you want to want to project onto?",
@@ -100,7 +168,7 @@ def main_menu():
                 k = int(k) if k.isdigit() else None
                 
                 if k and k > 0:
-                    df_analyzed = analyze_features(df[feats], n_clusters = k)
+                    df_analyzed = get_selector(entry, feats).transform(df, n_clusters = k, strategy = "medoid")
                     print(f'{k} features selected:', df_analyzed.columns.tolist())
                     
                     # save analyzed features to csv
@@ -111,11 +179,11 @@ def main_menu():
                     continue
             else:
                 try:
-                    df = pd.read_csv("data/synthetic_quarters.csv")
+                    entry = datasets.get("data/synthetic_quarters.csv")
                     print("Synthetic quarterly stats dataset selected.")
                     
-                    # remove columns with NaN values
-                    df = df.dropna(axis=1)
+                    # columns with NaN values are already removed in entry.clean
+                    df = entry.clean
                     
                     which_features = questionary.select(
                         "Which features do you want to analyze?",
@@ -126,10 +194,10 @@ def main_menu():
                         style=utils.custom_style,
                     ).ask()
                     if which_features == "All numeric features":
-                        feats = [ncol for ncol in df.select_dtypes(include=['number']).columns if ncol not in ['season_id', 'game_id']]
+                        feats = entry.features
                     if which_features == "Only first half (Q1, Q2) features":
-                        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-                        feats = [col for col in numeric_cols if 'Q3' not in col and 'Q4' not in col]
+                        numeric_cols = entry.numeric_cols
+                        feats = drop_quarters(numeric_cols, ['Q3', 'Q4'])
                     
                     k = questionary.text(
                         "How many features do you want to want to project onto?",
@@ -137,7 +205,7 @@ def main_menu():
                     ).ask()
                     k = int(k) if k.isdigit() else None
                     if k and k > 0:
-                        df_analyzed = analyze_features(df[feats], n_clusters = k)
+                        df_analyzed = get_selector(entry, feats).transform(df, n_clusters = k, strategy = "medoid")
                         print(f'{k} features selected:', df_analyzed.columns.tolist())
                         
                         # save analyzed features to csv
@@ -152,6 +220,9 @@ def main_menu():
                     continue
                 
         elif option == 4:
+            from src.nba_synth.conjectures import generate_conjectures, generate_conjectures_batch
+            from src.nba_synth.pruning import prune_search_space
+
             database = questionary.select(
                 "Which dataset do you want to use for conjecture generation?",
                 choices=[
@@ -164,12 +235,12 @@ def main_menu():
             ).ask()
             
             if database == "Original games dataset":
-                df = pd.read_csv("data/games.csv")
+                entry = datasets.get("data/games.csv")
                 print("Original games dataset selected.")
             
             if database == "Synthetic quarterly stats dataset":
                 try:
-                    df = pd.read_csv("data/synthetic_quarters.csv")
+                    entry = datasets.get("data/synthetic_quarters.csv")
                     print("Synthetic quarterly stats dataset selected.")
                 except FileNotFoundError:
                     console.print("[red]Synthetic quarterly stats dataset not found. Please generate it first.[/red]")
@@ -177,7 +248,7 @@ def main_menu():
             
             if database == "Analyzed features from original games dataset":
                 try:
-                    df = pd.read_csv("data/analyzed_features.csv")
+                    entry = datasets.get("data/analyzed_features.csv")
                     print("Analyzed features from original games dataset selected.")
                 except FileNotFoundError:
                     console.print("[red]Analyzed features from original games dataset not found. Please run feature analysis first.[/red]")
@@ -185,25 +256,38 @@ def main_menu():
             
             if database == "Analyzed features from synthetic quarterly stats dataset":
                 try:
-                    df = pd.read_csv("data/synthetic_analyzed_features.csv")
+                    entry = datasets.get("data/synthetic_analyzed_features.csv")
                     print("Analyzed features from synthetic quarterly stats dataset selected.")
                 except FileNotFoundError:
                     console.print("[red]Analyzed features from synthetic quarterly stats dataset not found. Please run feature analysis first.[/red]")
                     continue
             
-            # remove columns with NaN values
-            df = df.dropna(axis=1)
-                
-            features = [col for col in df.select_dtypes(include=['number']).columns if col not in ['season_id', 'game_id']]
-            boolean_cols = df.select_dtypes(include=['bool']).columns.tolist()
+            # columns with NaN values are already removed in entry.clean
+            df = entry.clean
+            features = list(entry.features)
+            boolean_cols = list(entry.boolean_cols)
             
             target_type = questionary.select(
                 "What type of target variable do you want?",
                 choices=[ "Randomly select one of the features as target",
-                          "Specify a target feature"],
+                          "Specify a target feature",
+                          "Use every feature as a target (parallel)"],
                 style=utils.custom_style,
             ).ask()
             
+            if target_type == "Use every feature as a target (parallel)":
+                # results stream back as each target finishes
+                for target, conjectures in generate_conjectures_batch(df, features, features, boolean_cols,
+                                                                      timeout=600, cache=get_conjecture_cache(),
+                                                                      prune=True, coreset=True):
+                    if isinstance(conjectures, Exception):
+                        console.print(f"[red]{target}: failed ({type(conjectures).__name__})[/red]")
+                        continue
+                    console.print(f"[bold cyan]{target}[/bold cyan]:", len(conjectures), "conjectures generated")
+                    for conj in conjectures[:3]:
+                        console.print("  ", conj)
+                continue
+
             if target_type == "Specify a target feature":
                 target = questionary.select(
                     "Select the target feature:",
@@ -222,8 +306,14 @@ def main_menu():
             # ensure target is not in features
             features.remove(target)
 
+            # drop constant / redundant features and uninformative hypotheses before solving
+            features, boolean_cols, removed = prune_search_space(df, features, target, boolean_cols)
+            for reason, names in removed.items():
+                if names:
+                    console.print(f"[dim]Pruned ({reason.replace('_', ' ')}): {', '.join(names)}[/dim]")
+
             # conjecture on those features
-            conjectures = generate_conjectures(df, features, target, boolean_cols)
+            conjectures = generate_conjectures(df, features, target, boolean_cols, cache=get_conjecture_cache())
 
             console.print(len(conjectures), "conjectures generated:")
 
@@ -240,5 +330,26 @@ def main_menu():
             console.print("[red]Invalid option. Please choose a valid option.[/red]")
 
 if __name__ == "__main__":
-    main_menu()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--startup-time", action="store_true",
+                        help="Report startup timings and exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record wall/CPU time, RSS and shapes per stage and print them after each action")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Also trace peak Python allocations per stage (slower)")
+    parser.add_argument("--profile-json", default=None,
+                        help="Write the last action's stage records to this JSON file")
+    parser.add_argument("--profile-stats", default=None,
+                        help="Write a pstats file for the slowest stage of the last action")
+    parser.add_argument("--profile-stage", default=None,
+                        help="Stage to run under cProfile for --profile-stats (default: every top-level stage)")
+    args = parser.parse_args()
+
+    if args.startup_time:
+        startup_time()
+    else:
+        if args.profile:
+            telemetry.enable(memory=args.profile_memory,
+                             profile_stage=(args.profile_stage or "*") if args.profile_stats else None)
+        main_menu(args)
     
\ No newline at end of file
@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.nba_synth.sample_data import make_games
+from src.nba_synth.telemetry import _max_rss
+
+ID_COLUMNS = ['replica_id', 'season_id', 'game_id']
+
+
+def parse_scale(text: str) -> int:
+    """'1k' -> 1000, '1M' -> 1000000."""
+    text = text.strip()
+    factor = {'k': 1_000, 'K': 1_000, 'm': 1_000_000, 'M': 1_000_000}.get(text[-1], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def measure(fn, memory: bool):
+    """Run `fn()`; return its result and wall/CPU seconds, plus tracemalloc peak bytes if `memory`."""
+    if memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = fn()
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return result, {"wall_s": round(wall, 6), "cpu_s": round(cpu, 6), "peak_bytes": peak}
+
+
+def shape_of(result):
+    df = result[0] if isinstance(result, tuple) else result
+    if isinstance(df, pd.DataFrame):
+        return {"rows": len(df), "cols": df.shape[1]}
+    if isinstance(df, list):
+        return {"rows": len(df), "cols": None}
+    return {"rows": None, "cols": None}
+
+
+def stages(csv_path: str, store_dir: str, args):
+    """(name, fn) pairs; each fn takes the state dict filled by the earlier stages."""
+    from src.nba_synth.store import load_dataset
+    from src.nba_synth.synthetic import synthesize_quarters
+    from src.nba_synth.features import analyze_features
+    from src.nba_synth.generate_hyps import generate_hyps
+
+    def load(state):
+        state["games"] = load_dataset(csv_path, store_dir=store_dir)
+        return state["games"]
+
+    def synthesize(state):
+        state["synth"] = synthesize_quarters(state["games"], seed=0, output=None)
+        return state["synth"]
+
+    def features(state):
+        clean = state["synth"].dropna(axis=1)
+        numeric = [c for c in clean.select_dtypes(include=['number']).columns if c not in ID_COLUMNS]
+        analyzed = analyze_features(clean[numeric], n_clusters=args.clusters, strategy="medoid")
+        boolean_cols = clean.select_dtypes(include=['bool']).columns.tolist()
+        state["features"] = analyzed.columns.tolist()
+        state["analyzed"] = pd.concat([analyzed, clean[boolean_cols]], axis=1)
+        return state["analyzed"]
+
+    def hypotheses(state):
+        state["hyp_df"], state["hyps"] = generate_hyps(state["analyzed"])
+        return state["hyp_df"]
+
+    def conjectures(state):
+        from src.nba_synth.conjectures import generate_conjectures
+
+        df = state["hyp_df"].head(args.conjecture_rows)
+        target, *feats = state["features"]
+        return generate_conjectures(df, feats, target, state["hyps"], prune=True, coreset=args.coreset)
+
+    return [("load", load), ("synthesize", synthesize), ("features", features),
+            ("hypotheses", hypotheses), ("conjectures", conjectures)]
+
+
+def run_scale(n_games: int, args) -> list:
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "games.csv")
+        _, stats = measure(lambda: make_games(n_games, seed=args.seed).to_csv(csv_path, index=False), False)
+        records.append({"scale": n_games, "stage": "generate", **stats,
+                        "file_bytes": os.path.getsize(csv_path)})
+
+        for repeat in range(args.repeat + (0 if args.no_memory else 1)):
+            # the last pass traces memory; timing passes run untraced
+            memory = not args.no_memory and repeat == args.repeat
+            state = {}
+            store_dir = os.path.join(tmp, f"store{repeat}")
+            for name, fn in stages(csv_path, store_dir, args):
+                if name in args.skip:
+                    continue
+                try:
+                    result, stats = measure(lambda: fn(state), memory)
+                except Exception as e:
+                    records.append({"scale": n_games, "stage": name, "error": f"{type(e).__name__}: {e}"})
+                    break
+                record = {"scale": n_games, "stage": name, "pass": "memory" if memory else "time",
+                          **stats, **shape_of(result)}
+                if not memory:
+                    record.pop("peak_bytes")
+                records.append(record)
+                print(f"{n_games:>9} {name:<12} {record['pass']:<6} "
+                      f"{stats['wall_s']:9.3f}s wall {stats['cpu_s']:9.3f}s cpu"
+                      + (f" {stats['peak_bytes'] / 2**20:9.1f} MiB peak" if memory else ""))
+    return records
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(old_path: str, new: dict):
+    """Print the wall-time ratio new/old for every (scale, stage) in both runs."""
+    with open(old_path) as f:
+        old = json.load(f)
+
+    def times(run):
+        out = {}
+        for r in run["results"]:
+            if r.get("pass") == "time":
+                out.setdefault((r["scale"], r["stage"]), []).append(r["wall_s"])
+        return {k: min(v) for k, v in out.items()}
+
+    before, after = times(old), times(new)
+    print(f"\ncompared with {old['environment'].get('commit')}:")
+    for key in sorted(set(before) & set(after)):
+        ratio = after[key] / before[key] if before[key] else float("nan")
+        print(f"{key[0]:>9} {key[1]:<12} {before[key]:9.3f}s -> {after[key]:9.3f}s  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile each pipeline stage on generated games.csv files.")
+    parser.add_argument("--scales", default="1k,10k,100k",
+                        help="Comma-separated numbers of games, e.g. 1k,10k,100k,1M")
+    parser.add_argument("--repeat", type=int, default=1, help="Untraced timing passes per scale")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--skip", nargs="*", default=[],
+                        choices=["load", "synthesize", "features", "hypotheses", "conjectures"])
+    parser.add_argument("--clusters", type=int, default=8)
+    parser.add_argument("--conjecture-rows", type=int, default=5000,
+                        help="Rows passed to the conjecture stage (LP size)")
+    parser.add_argument("--coreset", action="store_true", help="Run the conjecture stage in coreset mode")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="Results JSON (default: data/benchmarks/<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    env = environment()
+    results = []
+    for scale in args.scales.split(","):
+        results += run_scale(parse_scale(scale), args)
+    # None where the resource module is unavailable (Windows)
+    run = {"environment": env, "args": vars(args), "max_rss_bytes": _max_rss(), "results": results}
+
+    output = args.output or os.path.join("data", "benchmarks", f"{(env['commit'] or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(args.compare, run)
+
+
+if __name__ == "__main__":
+    main()
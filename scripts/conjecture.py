@@ -1,19 +1,42 @@
-
 import argparse
 import pandas as pd
+from src.nba_synth.store import load_dataset
 from src.nba_synth.features import analyze_features
-from src.nba_synth.conjectures import generate_conjectures
+from src.nba_synth.conjectures import generate_conjectures, ConjectureCache
+from src.nba_synth.pruning import prune_search_space
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", default="data/synthetic_games.csv")
     parser.add_argument("--clusters", type=int, default=3)
+    parser.add_argument("--target", default=None,
+                        help="Target feature (default: first selected feature)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-solve instead of reusing cached conjectures")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="Pass every feature and hypothesis to the solver unfiltered")
+    parser.add_argument("--top-m", type=int, default=None,
+                        help="Keep only the M features most correlated with the target")
+    parser.add_argument("--coreset", action="store_true",
+                        help="Solve on a coreset of rows and verify the results on the full table")
     args = parser.parse_args()
 
-    df = pd.read_csv(args.input)
-    features = analyze_features(df, n_clusters=args.clusters)
+    df = load_dataset(args.input).dropna(axis=1)
+    numeric = [col for col in df.select_dtypes(include=['number']).columns if col not in ['season_id', 'game_id']]
+    boolean_cols = df.select_dtypes(include=['bool']).columns.tolist()
+    features = analyze_features(df[numeric], n_clusters=args.clusters).columns.tolist()
+
+    target = args.target or features[0]
+    features = [f for f in features if f != target]
+    cache = None if args.no_cache else ConjectureCache()
+
+    if not args.no_prune:
+        features, boolean_cols, removed = prune_search_space(df, features, target, boolean_cols, top_m=args.top_m)
+        for reason, names in removed.items():
+            if names:
+                print(f"Pruned ({reason.replace('_', ' ')}):", ", ".join(names))
 
-    conjectures = generate_conjectures(features)
+    conjectures = generate_conjectures(df, features, target, boolean_cols, cache=cache, coreset=args.coreset)
     print("Generated Conjectures:")
     for c in conjectures:
         print("-", c)
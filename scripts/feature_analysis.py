@@ -1,21 +1,48 @@
-
 import argparse
+import os
 import pandas as pd
-from src.nba_synth.features import analyze_features
+from src.nba_synth.store import load_dataset
+from src.nba_synth.features import FeatureSelector
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", default="data/synthetic_games.csv")
     parser.add_argument("--clusters", type=int, default=None,
                         help="Number of clusters (if None, will prompt user)")
+    parser.add_argument("--selector", default=None,
+                        help="Path (.npz) to load a fitted selector from, or save it to")
+    parser.add_argument("--strategy", choices=["first", "medoid"], default="medoid",
+                        help="How each cluster's representative feature is picked")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Stream the input in chunks of this many rows (out-of-core mode)")
     args = parser.parse_args()
 
-    df = pd.read_csv(args.input)
+    if args.chunk_size:
+        df = pd.read_csv(args.input, nrows=args.chunk_size)
+    else:
+        df = load_dataset(args.input).dropna(axis=1)
+    feats = [col for col in df.select_dtypes(include=['number']).columns if col not in ['season_id', 'game_id', 'replica_id']]
     k = args.clusters
     if k is None:
         k = int(input("How many features/clusters do you want to focus on? "))
 
-    results = analyze_features(df, n_clusters=k)
+    selector = None
+    if args.chunk_size:
+        # statistics are accumulated chunk by chunk; only the first chunk is shown below
+        selector = FeatureSelector().fit_stream(pd.read_csv(args.input, chunksize=args.chunk_size), columns=feats)
+        if args.selector:
+            selector.save(args.selector)
+    elif args.selector and os.path.exists(args.selector):
+        selector = FeatureSelector.load(args.selector)
+        if not selector.matches(df[feats]):
+            print("Stored selector was fitted on different data; refitting.")
+            selector = None
+    if selector is None:
+        selector = FeatureSelector().fit(df[feats])
+        if args.selector:
+            selector.save(args.selector)
+
+    results = selector.transform(df, n_clusters=k, strategy=args.strategy)
     print("Feature analysis complete. Cluster summary:")
     print(results.head())
 
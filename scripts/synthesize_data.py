@@ -1,17 +1,51 @@
 
 import argparse
 import pandas as pd
-from src.nba_synth.synthetic import synthesize_quarters
+from src.nba_synth.store import load_dataset
+from src.nba_synth.synthetic import synthesize_quarters, synthesize_replicas
+from src.nba_synth.sharding import synthesize_sharded
+from src.nba_synth.incremental import synthesize_incremental
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", default="data/games.csv")
     parser.add_argument("--output", default="data/synthetic_games.csv")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for reproducible output (default: fresh entropy)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes to synthesize shards in parallel")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Games per shard; enables sharded, streaming output")
+    parser.add_argument("--partition", choices=["rows", "season"], default="rows",
+                        help="Shard by row blocks or by season")
+    parser.add_argument("--replicas", type=int, default=1,
+                        help="Monte Carlo replicas, built in memory in one sweep; "
+                             "use '{replica}' in --output for one file each")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only synthesize games not already in --output and append them")
     args = parser.parse_args()
 
-    df = pd.read_csv(args.input)
-    df_synth = synthesize_quarters(df)
-    df_synth.to_csv(args.output, index=False)
+    sharding = [flag for flag, used in [("--workers", args.workers > 1), ("--chunk-size", args.chunk_size),
+                                        ("--partition season", args.partition == "season")] if used]
+    for mode, used in [("--replicas", args.replicas > 1), ("--incremental", args.incremental)]:
+        if used and sharding:
+            parser.error(f"{', '.join(sharding)} cannot be combined with {mode}; "
+                         "sharding only applies to a plain single-replica run.")
+
+    if args.incremental:
+        df = load_dataset(args.input)
+        df_new = synthesize_incremental(df, output=args.output, seed=args.seed)
+        print(f"{len(df_new)} new games synthesized")
+    elif args.replicas > 1:
+        df = load_dataset(args.input)
+        synthesize_replicas(df, args.replicas, seed=args.seed, output=args.output)
+    elif args.chunk_size or args.workers > 1 or args.partition == "season":
+        n = synthesize_sharded(args.input, args.output, seed=args.seed, workers=args.workers,
+                               chunk_size=args.chunk_size or 50_000, partition=args.partition)
+        print(f"{n} games synthesized")
+    else:
+        df = load_dataset(args.input)
+        synthesize_quarters(df, seed=args.seed, output=args.output)
     print(f"Synthetic data saved to {args.output}")
 
 if __name__ == "__main__":
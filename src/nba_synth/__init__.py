@@ -6,14 +6,59 @@ Tools for:
 1. Synthesizing quarter-by-quarter NBA game statistics
 2. Performing feature analysis + clustering
 3. Generating conjectures on features via TxGraffiti
+4. Caching the CSV datasets in a typed columnar store
 """
 
-from .synthetic import synthesize_quarters
-from .features import analyze_features
-from .conjectures import generate_conjectures
+import importlib
+
+# public name -> submodule defining it. Submodules are imported on first
+# access, so e.g. viewing a dataset does not pull in sklearn or txgraffiti.
+_EXPORTS = {
+    "synthesize_quarters": "synthetic",
+    "synthesize_replicas": "synthetic",
+    "synthesize_sharded": "sharding",
+    "synthesize_incremental": "incremental",
+    "analyze_features": "features",
+    "FeatureSelector": "features",
+    "StreamingMoments": "features",
+    "generate_conjectures": "conjectures",
+    "generate_conjectures_batch": "conjectures",
+    "prune_search_space": "pruning",
+    "evaluate_conjectures": "evaluation",
+    "load_dataset": "store",
+    "DatasetCache": "store",
+    "wide_to_long": "layout",
+    "long_to_wide": "layout",
+    "select_quarters": "layout",
+}
 
 __all__ = [
     "synthesize_quarters",
+    "synthesize_replicas",
+    "synthesize_sharded",
+    "synthesize_incremental",
     "analyze_features",
+    "FeatureSelector",
+    "StreamingMoments",
     "generate_conjectures",
-]
\ No newline at end of file
+    "generate_conjectures_batch",
+    "prune_search_space",
+    "evaluate_conjectures",
+    "load_dataset",
+    "DatasetCache",
+    "wide_to_long",
+    "long_to_wide",
+    "select_quarters",
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
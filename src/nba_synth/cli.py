@@ -0,0 +1,44 @@
+import argparse
+import json
+
+from .pipeline import load_config, merge_config, run_pipeline
+
+
+def main(argv=None):
+    """Headless pipeline: synthesize -> features -> hypotheses -> conjectures."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("config", nargs="?", default=None,
+                        help="YAML config (default: built-in defaults)")
+    parser.add_argument("--force", action="store_true",
+                        help="Recompute every stage instead of reusing cached outputs")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Where stage outputs are stored (overrides the config)")
+    parser.add_argument("--summary", default=None,
+                        help="Write stage keys, paths and conjecture counts to this JSON file")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config) if args.config else merge_config({})
+    if args.cache_dir:
+        config["cache_dir"] = args.cache_dir
+
+    summary = run_pipeline(config, force=args.force)
+
+    results = summary.pop("results")
+    counts = {}
+    for target, conjs in results.items():
+        if isinstance(conjs, Exception):
+            print(f"{target}: failed ({type(conjs).__name__})")
+            counts[target] = None
+            continue
+        counts[target] = len(conjs)
+        print(f"{target}: {len(conjs)} conjectures")
+        for conj in conjs[:3]:
+            print("  ", conj)
+
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump({"stages": summary, "conjectures": counts}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
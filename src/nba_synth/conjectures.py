@@ -1,24 +1,285 @@
-
 import txgraffiti 
 import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import signal
+import time
 
 from types import MethodDescriptorType
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, Optional, Tuple, Union
 from txgraffiti.playground import ConjecturePlayground
 from txgraffiti.generators import convex_hull, linear_programming
 from txgraffiti.heuristics import morgan_accept, dalmatian_accept
 from txgraffiti.processing import remove_duplicates, sort_by_touch_count
+from .pruning import prune_search_space, conjecture_coreset
+from .evaluation import evaluate_conjectures
+from .telemetry import stage, timed
+
+def conjecture_key(df: pd.DataFrame, feats: list, targ: str, hyps: list,
+                   coreset: bool = False) -> str:
+    """Content hash of the columns a conjecture run reads, plus its arguments."""
+    cols = list(dict.fromkeys(list(feats) + [targ] + list(hyps)))
+    args = {
+        "feats": list(feats), "target": targ, "hyps": list(hyps),
+        "dtypes": [str(df[c].dtype) for c in cols],
+        "txgraffiti": getattr(txgraffiti, "__version__", ""),
+    }
+    if coreset:
+        # only added when set, so keys of full-table runs are unchanged
+        args["coreset"] = True
+    h = hashlib.sha256()
+    h.update(json.dumps(args).encode())
+    h.update(pd.util.hash_pandas_object(df[cols], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ConjectureCache:
+    """On-disk cache of conjecture lists, keyed by `conjecture_key`.
+
+    Entries are cloudpickled files in `cache_dir`. A hit refreshes the
+    entry's mtime, and the least recently used entries are deleted once the
+    directory exceeds `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join("data", ".conjecture_cache"),
+                 max_bytes: int = 256 * 1024**2):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".pkl")
+
+    def get(self, key: str) -> Optional[list]:
+        import cloudpickle
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                conjs = cloudpickle.load(f)
+        except (OSError, EOFError, ValueError, AttributeError, ImportError):
+            return None
+        os.utime(path)
+        return conjs
+
+    def put(self, key: str, conjs: list):
+        import cloudpickle
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            cloudpickle.dump(conjs, f)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                st = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((st.st_mtime_ns, st.st_size, name))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        # always keep the newest entry
+        for _, size, name in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.cache_dir, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+@timed("generate_conjectures")
+def generate_conjectures(df: pd.DataFrame, feats: list, targ: str, hyps: list,
+                         cache: Optional[ConjectureCache] = None, prune: bool = False,
+                         top_m: Optional[int] = None, coreset: bool = False) -> list[txgraffiti.Conjecture]:
+    """Discover linear conjectures for `targ`; with a `cache`, identical runs are read from disk.
+
+    With `prune`, the features and hypotheses are first reduced by
+    `prune_search_space` (keeping at most `top_m` features).
+
+    With `coreset`, the LPs are solved on `conjecture_coreset(df, ...)`
+    instead of every row. Candidates are then checked against the full
+    table: those that fail on any row are dropped and the rest are re-sorted
+    by their touch counts on `df`.
+    """
+    if prune:
+        feats, hyps, _ = prune_search_space(df, feats, targ, hyps, top_m=top_m)
+    if cache is not None:
+        key = conjecture_key(df, feats, targ, hyps, coreset=coreset)
+        conjs = cache.get(key)
+        if conjs is None:
+            conjs = generate_conjectures(df, feats, targ, hyps, coreset=coreset)
+            cache.put(key, conjs)
+        return conjs
+    if coreset:
+        conjs = generate_conjectures(conjecture_coreset(df, feats, targ, hyps), feats, targ, hyps)
+        return verify_conjectures(conjs, df)
 
-def generate_conjectures(df: pd.DataFrame, feats: list, targ: str, hyps: list) -> list[txgraffiti.Conjecture]:
-    
     pg = ConjecturePlayground(df, object_symbol="game")
     
-    conjs = pg.discover(
-    methods         = [linear_programming],
-    features        = feats,
-    target          = targ,
-    hypothesis      = hyps,
-    heuristics      = [morgan_accept, dalmatian_accept],
-    post_processors = [remove_duplicates, sort_by_touch_count],
-    )
+    with stage("discover") as s:
+        s.frame(df)
+        conjs = pg.discover(
+        methods         = [linear_programming],
+        features        = feats,
+        target          = targ,
+        hypothesis      = hyps,
+        heuristics      = [morgan_accept, dalmatian_accept],
+        post_processors = [remove_duplicates, sort_by_touch_count],
+        )
 
     return conjs
+
+
+def verify_conjectures(conjs: list, df: pd.DataFrame) -> list:
+    """Keep the conjectures that hold on every row of `df`, sorted by touch count on `df`."""
+    result = evaluate_conjectures(conjs, df)
+    keep = [i for i in np.argsort(-result["touch"], kind="stable") if result["valid"][i]]
+    return [conjs[i] for i in keep]
+
+
+# Workers interrupt a slow target themselves where SIGALRM exists; elsewhere
+# (Windows) the parent enforces the timeout.
+_HAS_ALARM = hasattr(signal, "setitimer")
+# How often the parent checks running targets against the timeout.
+_POLL_SECONDS = 0.1
+
+# Per-worker copy of the DataFrame, installed once by the pool initializer
+# (inherited without copying under the fork start method).
+_worker_df = None
+
+
+def _init_worker(df: pd.DataFrame):
+    global _worker_df
+    _worker_df = df
+
+
+class _Deadline(BaseException):
+    """Raised by the alarm handler. A BaseException, so txgraffiti's
+    `except Exception` guards around generators cannot swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise _Deadline
+
+
+def _discover_target(feats: list, targ: str, hyps: list, timeout: Optional[float],
+                     coreset: bool = False) -> bytes:
+    """Run generate_conjectures for one target inside a worker.
+
+    Conjectures close over lambdas, so they are sent back with cloudpickle.
+    The timeout is enforced in the worker with SIGALRM, so a slow target
+    frees its worker instead of blocking it; the parent passes None where
+    SIGALRM is unavailable.
+    """
+    import cloudpickle
+
+    use_alarm = timeout is not None
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        conjs = generate_conjectures(_worker_df, feats, targ, hyps, coreset=coreset)
+    except _Deadline:
+        raise TimeoutError(f"{targ}: no result within {timeout}s") from None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return cloudpickle.dumps(conjs)
+
+
+def generate_conjectures_batch(df: pd.DataFrame, feats: list, targets: list, hyps: list,
+                               workers: Optional[int] = None, timeout: Optional[float] = None,
+                               cache: Optional[ConjectureCache] = None, prune: bool = False,
+                               top_m: Optional[int] = None, coreset: bool = False
+                               ) -> Iterator[Tuple[str, Union[list, Exception]]]:
+    """Generate conjectures for several targets in a process pool.
+
+    Each target is conjectured against `feats` minus itself. The pool
+    receives one read-only copy of the needed columns of `df` per worker.
+    Results are yielded as `(target, conjectures)` pairs in completion
+    order. A target that fails or exceeds `timeout` seconds yields
+    `(target, exception)` instead. Without SIGALRM the parent times each
+    target from when the pool hands it to a worker (so a target queued
+    behind a busy worker may expire slightly early), stops waiting for it,
+    and terminates the pool's workers once the batch is over. With a `cache`, cached targets are
+    yielded first without touching the pool. With `prune`, each target's
+    search space is reduced by `prune_search_space` before it is submitted.
+    `coreset` is passed through to `generate_conjectures`.
+    """
+    import cloudpickle
+
+    keys = {}
+    pending = []
+    for targ in targets:
+        target_feats = [f for f in feats if f != targ]
+        target_hyps = list(hyps)
+        if prune:
+            target_feats, target_hyps, _ = prune_search_space(df, target_feats, targ, target_hyps, top_m=top_m)
+        if cache is not None:
+            keys[targ] = conjecture_key(df, target_feats, targ, target_hyps, coreset=coreset)
+            conjs = cache.get(keys[targ])
+            if conjs is not None:
+                yield targ, conjs
+                continue
+        pending.append((targ, target_feats, target_hyps))
+    if not pending:
+        return
+
+    cols = list(dict.fromkeys(list(feats) + list(targets) + list(hyps)))
+    shared = df[cols]
+    workers = workers or os.cpu_count() or 1
+
+    worker_timeout = timeout if _HAS_ALARM else None
+    parent_timeout = None if _HAS_ALARM else timeout
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,))
+    abandoned = set()
+    try:
+        futures = {
+            pool.submit(_discover_target, target_feats, targ, target_hyps, worker_timeout, coreset): targ
+            for targ, target_feats, target_hyps in pending
+        }
+        started = {}
+        remaining = set(futures)
+        while remaining:
+            done, remaining = wait(remaining, return_when=FIRST_COMPLETED,
+                                   timeout=None if parent_timeout is None else _POLL_SECONDS)
+            for future in done:
+                targ = futures[future]
+                try:
+                    conjs = cloudpickle.loads(future.result())
+                except Exception as e:
+                    yield targ, e
+                    continue
+                if cache is not None:
+                    cache.put(keys[targ], conjs)
+                yield targ, conjs
+            if parent_timeout is None:
+                continue
+            now = time.monotonic()
+            for future in [f for f in remaining if f.running()]:
+                if now - started.setdefault(future, now) > parent_timeout:
+                    remaining.discard(future)
+                    abandoned.add(future)
+                    yield futures[future], TimeoutError(f"{futures[future]}: no result within {timeout}s")
+            if remaining and sum(not f.done() for f in abandoned) >= workers:
+                # every worker is stuck in an abandoned target; nothing else can start
+                for future in remaining:
+                    yield futures[future], TimeoutError(f"{futures[future]}: no free worker within the timeout")
+                remaining = set()
+    finally:
+        if any(not f.done() for f in abandoned):
+            for process in list((pool._processes or {}).values()):
+                process.terminate()
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            pool.shutdown(wait=True)
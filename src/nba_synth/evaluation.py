@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from typing import Optional, Tuple
+from .telemetry import timed
+
+# slack sign per operator: slack = sign * (lhs - rhs), matching Inequality.slack
+_SIGN = {"<": -1.0, "<=": -1.0, "≤": -1.0, ">": 1.0, ">=": 1.0, "≥": 1.0, "==": 1.0}
+_STRICT = {"<", ">"}
+
+
+def _slack_expression(conj):
+    conclusion = getattr(conj, "conclusion", None)
+    op = getattr(conclusion, "op", None)
+    if op not in _SIGN:
+        return None
+    sign = _SIGN[op]
+    return lambda frame: sign * (conclusion.lhs(frame) - conclusion.rhs(frame))
+
+
+def compile_conjectures(conjs: list, columns: list, tol: float = 1e-9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compile conjectures with linear inequality conclusions into `(A, b, linear)`.
+
+    The slack of conjecture `i` on a row `x` (ordered as `columns`) is
+    `A[i] @ x + b[i]`. Coefficients are read off by evaluating each slack on
+    a probe frame holding a zero row and one unit row per column, then
+    checked on two random rows. `linear[i]` is False for conjectures that
+    are not linear in `columns` (or not inequalities); their rows of `A`
+    and `b` are zero. For `==` conclusions the slack is `lhs - rhs` and
+    any nonzero value is a violation.
+    """
+    p = len(columns)
+    rng = np.random.default_rng(0)
+    check = rng.uniform(-10, 10, size=(2, p))
+    probe = pd.DataFrame(np.vstack([np.zeros((1, p)), np.eye(p), check]), columns=columns)
+
+    A = np.zeros((len(conjs), p))
+    b = np.zeros(len(conjs))
+    linear = np.zeros(len(conjs), dtype=bool)
+    for i, conj in enumerate(conjs):
+        slack = _slack_expression(conj)
+        if slack is None:
+            continue
+        try:
+            values = np.asarray(slack(probe), dtype=np.float64)
+        except (KeyError, TypeError, ValueError, ZeroDivisionError):
+            continue
+        coef = values[1:p + 1] - values[0]
+        expected = check @ coef + values[0]
+        if np.allclose(values[p + 1:], expected, rtol=1e-9, atol=tol):
+            A[i], b[i], linear[i] = coef, values[0], True
+    return A, b, linear
+
+
+@timed("evaluate_conjectures")
+def evaluate_conjectures(conjs: list, df: pd.DataFrame, columns: Optional[list] = None,
+                         tol: float = 1e-9, block_size: Optional[int] = None) -> dict:
+    """Evaluate a batch of conjectures over every row of `df` at once.
+
+    Linear conjectures are compiled with `compile_conjectures` and their
+    slacks computed as one matrix product per block of rows; others fall
+    back to evaluating their slack directly, and conclusions without a
+    slack (e.g. `!=`) to their boolean value. Each distinct hypothesis is
+    evaluated once. Only rows satisfying a conjecture's hypothesis are
+    considered.
+
+    Returns a dict of arrays aligned with `conjs`:
+      - "valid": the conjecture holds on every hypothesis row,
+      - "touch": number of hypothesis rows with zero slack (within `tol`),
+      - "hyp_count": number of hypothesis rows,
+      - "sharp": index labels of `df` where the bound is tight.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=["number", "bool"]).columns.tolist()
+    k, n = len(conjs), len(df)
+
+    # distinct hypotheses, evaluated once each
+    hyp_names = {}
+    for conj in conjs:
+        hyp_names.setdefault(conj.hypothesis.name, conj.hypothesis)
+    order = list(hyp_names)
+    H = np.column_stack([np.asarray(hyp_names[name](df), dtype=bool) for name in order]) \
+        if order else np.zeros((n, 0), dtype=bool)
+    hyp_idx = np.array([order.index(conj.hypothesis.name) for conj in conjs], dtype=np.intp)
+    ops = [getattr(conj.conclusion, "op", None) for conj in conjs]
+    strict = np.array([op in _STRICT for op in ops], dtype=bool)
+    equal = np.array([op == "==" for op in ops], dtype=bool)
+
+    A, b, linear = compile_conjectures(conjs, columns, tol=tol)
+    lin = np.flatnonzero(linear)
+    other = np.flatnonzero(~linear)
+    X = df[columns].to_numpy(dtype=np.float64)
+
+    valid = np.ones(k, dtype=bool)
+    touch = np.zeros(k, dtype=np.int64)
+    sharp_rows, sharp_cols = [], []
+
+    def accumulate(S, rows, cols):
+        # S: slack block (len(rows) x len(cols))
+        inside = H[rows][:, hyp_idx[cols]]
+        violated = np.where(equal[cols], np.abs(S) > tol,
+                            np.where(strict[cols], S <= tol, S < -tol)) & inside
+        valid[cols] &= ~violated.any(axis=0)
+        tight = (np.abs(S) <= tol) & inside
+        touch[cols] += tight.sum(axis=0)
+        r, c = np.nonzero(tight)
+        sharp_rows.append(rows[r])
+        sharp_cols.append(cols[c])
+
+    if len(lin):
+        if block_size is None:
+            block_size = max(1, (1 << 22) // len(lin))
+        At, bl = A[lin].T, b[lin]
+        for start in range(0, n, block_size):
+            rows = np.arange(start, min(start + block_size, n))
+            accumulate(X[rows] @ At + bl, rows, lin)
+    for i in other:
+        slack = _slack_expression(conjs[i])
+        if slack is not None:
+            S = np.asarray(slack(df), dtype=np.float64)
+        else:
+            # no slack: holding rows are never tight, failing rows are violations
+            S = np.where(np.asarray(conjs[i].conclusion(df), dtype=bool), np.inf, -np.inf)
+            strict[i] = equal[i] = False
+        accumulate(S[:, None], np.arange(n), np.array([i]))
+
+    rows = np.concatenate(sharp_rows) if sharp_rows else np.zeros(0, dtype=np.intp)
+    cols = np.concatenate(sharp_cols) if sharp_cols else np.zeros(0, dtype=np.intp)
+    by_conj = np.argsort(cols, kind="stable")
+    splits = np.searchsorted(cols[by_conj], np.arange(1, k))
+    sharp = [df.index[r] for r in np.split(rows[by_conj], splits)] if k else []
+
+    return {
+        "valid": valid,
+        "touch": touch,
+        "hyp_count": H.sum(axis=0)[hyp_idx] if k else np.zeros(0, dtype=np.int64),
+        "sharp": sharp,
+    }
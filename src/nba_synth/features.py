@@ -1,44 +1,352 @@
 
+import hashlib
 import pandas as pd
 import numpy as np
 
 from sklearn.feature_selection import VarianceThreshold
 from sklearn.decomposition import PCA
-from sklearn.cluster import AgglomerativeClustering
-from sklearn.metrics import pairwise_distances
-
-def analyze_features(X: pd.DataFrame, n_clusters: int = 3) -> pd.DataFrame:
-
-    var_threshold = 0.01
-    corr_threshold = 0.9
-    random_state = 42
-
-    # 1. Variance threshold
-    vt = VarianceThreshold(threshold=var_threshold)
-    X_var = vt.fit_transform(X)
-    kept_features = X.columns[vt.get_support()]
-    X_reduced = pd.DataFrame(X_var, columns=kept_features, index=X.index)
-
-    # 2. Correlation filtering
-    corr = X_reduced.corr().abs()
-    upper = corr.where(np.triu(np.ones(corr.shape), k=1).astype(bool))
-    to_drop = [col for col in upper.columns if any(upper[col] > corr_threshold)]
-    X_reduced = X_reduced.drop(columns=to_drop)
-
-    # 3. Dimensionality reduction
-    if n_clusters is None:
-        n_clusters = min(20, X_reduced.shape[1] // 2)  # heuristic
-        
-    dist = pairwise_distances(X_reduced.T, metric="correlation")
-    clustering = AgglomerativeClustering(n_clusters=n_clusters,
-                                        #  affinity="precomputed",
-                                            linkage="average")
-    clusters = clustering.fit_predict(dist)
-    
-    selected_features = []
-    for c in np.unique(clusters):
-        selected_features.append(np.where(clusters == c)[0][0])  # pick first feature
-        
-    X_final = X_reduced.iloc[:, selected_features]
-
-    return X_final
+from scipy.cluster.hierarchy import cut_tree, linkage
+from scipy.spatial.distance import squareform
+from typing import Optional
+from .telemetry import stage, timed
+
+
+def standardize(X: np.ndarray, dtype=np.float32) -> np.ndarray:
+    """Center and scale columns so that `Z.T @ Z` is the Pearson correlation matrix.
+
+    Constant columns are left as zeros, so their correlations come out as 0
+    rather than NaN.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    centered = X - X.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    norms[norms == 0] = np.inf
+    return (centered / norms).astype(dtype, copy=False)
+
+
+def _exceeds_earlier(corr_block: np.ndarray, start: int, threshold: float) -> np.ndarray:
+    """For columns start.. of `corr_block`, whether any strictly earlier row exceeds `threshold` in |corr|."""
+    rows, cols = corr_block.shape
+    earlier = np.arange(rows)[:, None] < np.arange(start, start + cols)[None, :]
+    return ((np.abs(corr_block) > threshold) & earlier).any(axis=0)
+
+
+def correlated_to_drop(Z: np.ndarray, threshold: float, block_size: Optional[int] = None,
+                       corr: Optional[np.ndarray] = None) -> np.ndarray:
+    """Boolean mask of columns whose |correlation| with any earlier column exceeds `threshold`.
+
+    Same rule as masking the upper triangle of `corr().abs()` and dropping
+    every column with an entry above the threshold. `Z` must come from
+    `standardize`. If the full correlation matrix is already known, pass it
+    as `corr`. Otherwise, with `block_size`, it is computed `block_size`
+    columns at a time, so memory stays O(p * block_size).
+    """
+    if corr is not None:
+        return _exceeds_earlier(corr, 0, threshold)
+    p = Z.shape[1]
+    block_size = p if block_size is None else max(1, block_size)
+    drop = np.zeros(p, dtype=bool)
+    for start in range(0, p, block_size):
+        stop = min(start + block_size, p)
+        # rows: columns 0..stop, cols: this block
+        drop[start:stop] = _exceeds_earlier(Z[:, :stop].T @ Z[:, start:stop], start, threshold)
+    return drop
+
+
+def correlation_distance(corr: np.ndarray) -> np.ndarray:
+    """Correlation distance 1 - r, as `pairwise_distances(..., metric="correlation")` gives."""
+    dist = 1.0 - np.asarray(corr, dtype=np.float64)
+    np.clip(dist, 0.0, 2.0, out=dist)
+    np.fill_diagonal(dist, 0.0)
+    return dist
+
+
+def cluster_medoids(dist: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Index of each cluster's medoid: the member with the smallest mean distance to the rest.
+
+    One pass over `dist`: a (p x k) matrix product against the one-hot
+    cluster membership gives every feature's summed distance to each
+    cluster, and a lexsort picks the best member per cluster. Ties go to the
+    earlier column. Returned in cluster-label order.
+    """
+    uniq, labels = np.unique(labels, return_inverse=True)
+    onehot = np.zeros((len(labels), len(uniq)))
+    onehot[np.arange(len(labels)), labels] = 1.0
+    sizes = onehot.sum(axis=0)
+    within = (dist @ onehot)[np.arange(len(labels)), labels]
+    score = within / np.maximum(sizes[labels] - 1, 1)
+    order = np.lexsort((np.arange(len(labels)), score, labels))
+    first = np.r_[True, labels[order][1:] != labels[order][:-1]]
+    return order[first]
+
+
+def frame_fingerprint(X: pd.DataFrame) -> str:
+    """Content hash of a DataFrame's column names and values."""
+    h = _fingerprint_start(X.columns)
+    _fingerprint_update(h, X)
+    return _fingerprint_finish(h, len(X))
+
+
+# The fingerprint is built incrementally so chunked input hashes the same as
+# the whole frame (given the same column dtypes).
+def _fingerprint_start(columns):
+    h = hashlib.sha256()
+    h.update("\x1f".join(map(str, columns)).encode())
+    return h
+
+
+def _fingerprint_update(h, chunk: pd.DataFrame):
+    h.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+
+
+def _fingerprint_finish(h, n_rows: int) -> str:
+    h.update(str(n_rows).encode())
+    return h.hexdigest()
+
+
+class StreamingMoments:
+    """Single-pass column means and co-moments over DataFrame chunks.
+
+    Chunks are merged with the pairwise update of Chan et al., so memory is
+    O(p^2) regardless of the number of rows and the result is as accurate as
+    a two-pass computation. Columns containing any NaN are flagged in
+    `has_nan` (their moments are not meaningful), mirroring `dropna(axis=1)`.
+    """
+
+    def __init__(self, columns: list):
+        self.columns = list(columns)
+        p = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(p)
+        self.comoment = np.zeros((p, p))
+        self.has_nan = np.zeros(p, dtype=bool)
+        self._hash = _fingerprint_start(self.columns)
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingMoments":
+        chunk = chunk[self.columns]
+        _fingerprint_update(self._hash, chunk)
+        X = chunk.to_numpy(dtype=np.float64, na_value=np.nan)
+        nan = np.isnan(X)
+        self.has_nan |= nan.any(axis=0)
+        X = np.where(nan, 0.0, X)
+
+        n_b = len(X)
+        if n_b == 0:
+            return self
+        mean_b = X.mean(axis=0)
+        centered = X - mean_b
+        comoment_b = centered.T @ centered
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.comoment += comoment_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean += delta * (n_b / n)
+        self.n = n
+        return self
+
+    @property
+    def variances(self) -> np.ndarray:
+        """Population variances (ddof=0), as VarianceThreshold computes them."""
+        return np.diag(self.comoment) / max(self.n, 1)
+
+    def correlation(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Pearson correlation matrix, optionally restricted to the columns in `mask`."""
+        C = self.comoment if mask is None else self.comoment[np.ix_(mask, mask)]
+        scale = np.sqrt(np.diag(C))
+        scale[scale == 0] = np.inf
+        return C / np.outer(scale, scale)
+
+    @property
+    def fingerprint(self) -> str:
+        return _fingerprint_finish(self._hash.copy(), self.n)
+
+
+class FeatureSelector:
+    """Variance filter, correlation filter and average-linkage clustering of features.
+
+    `fit` keeps every intermediate artifact: the variance mask, the
+    correlation matrix of the surviving features and the full dendrogram.
+    Selecting a different number of clusters then only cuts the stored tree,
+    and `transform` projects any frame with the same columns onto the
+    selection by name. `save`/`load` persist the fitted state together with
+    a fingerprint of the data it was fitted on.
+    """
+
+    def __init__(self, var_threshold: float = 0.01, corr_threshold: float = 0.9,
+                 block_size: Optional[int] = None):
+        self.var_threshold = var_threshold
+        self.corr_threshold = corr_threshold
+        self.block_size = block_size
+
+    def fit(self, X: pd.DataFrame) -> "FeatureSelector":
+        # 1. Variance threshold
+        with stage("variance_threshold") as s:
+            vt = VarianceThreshold(threshold=self.var_threshold)
+            X_var = vt.fit_transform(X)
+            self.columns_ = list(X.columns)
+            self.variance_mask_ = vt.get_support()
+            X_reduced = s.frame(pd.DataFrame(X_var, columns=X.columns[self.variance_mask_], index=X.index))
+
+        # 2. Correlation filtering, computing the correlation matrix once and
+        # reusing it for the clustering distances below
+        with stage("correlation") as s:
+            s.frame(X_reduced)
+            corr, keep = self._correlation_filter(X_reduced)
+
+        return self._finish(list(X_reduced.columns[keep]), corr, frame_fingerprint(X))
+
+    def _correlation_filter(self, X_reduced: pd.DataFrame):
+        if X_reduced.isna().to_numpy().any():
+            # pairwise-complete correlations need pandas
+            corr = X_reduced.corr().fillna(0).to_numpy()
+            drop = correlated_to_drop(None, self.corr_threshold, corr=corr)
+        elif self.block_size is None:
+            Z = standardize(X_reduced.to_numpy())
+            corr = Z.T @ Z
+            drop = correlated_to_drop(Z, self.corr_threshold, corr=corr)
+        else:
+            Z = standardize(X_reduced.to_numpy())
+            drop = correlated_to_drop(Z, self.corr_threshold, self.block_size)
+            corr = None
+        keep = ~drop
+        if corr is not None:
+            corr = corr[np.ix_(keep, keep)]
+        else:
+            # blockwise mode never held the full matrix; only the kept block is needed
+            corr = Z[:, keep].T @ Z[:, keep]
+        return corr, keep
+
+    def fit_moments(self, moments: StreamingMoments) -> "FeatureSelector":
+        """Fit from accumulated `StreamingMoments` instead of an in-memory frame.
+
+        Columns with NaNs are dropped first, as `dropna(axis=1)` would. The
+        same variance, correlation and clustering steps then run on the
+        summaries.
+        """
+        self.columns_ = list(moments.columns)
+        self.variance_mask_ = ~moments.has_nan & (moments.variances > self.var_threshold)
+        kept = [c for c, m in zip(self.columns_, self.variance_mask_) if m]
+        corr = moments.correlation(self.variance_mask_)
+        keep = ~correlated_to_drop(None, self.corr_threshold, corr=corr)
+        return self._finish([c for c, k in zip(kept, keep) if k],
+                            corr[np.ix_(keep, keep)], moments.fingerprint)
+
+    def fit_stream(self, chunks, columns: Optional[list] = None) -> "FeatureSelector":
+        """Fit from an iterable of DataFrame chunks, e.g. `pd.read_csv(..., chunksize=...)`.
+
+        `columns` defaults to the numeric columns of the first chunk. Memory
+        scales with the number of features squared, not with the rows.
+        """
+        moments = None
+        for chunk in chunks:
+            if moments is None:
+                if columns is None:
+                    columns = chunk.select_dtypes(include=['number']).columns.tolist()
+                moments = StreamingMoments(columns)
+            moments.update(chunk)
+        if moments is None:
+            raise ValueError("No chunks to fit on.")
+        return self.fit_moments(moments)
+
+    def _finish(self, features: list, corr: np.ndarray, fingerprint: str) -> "FeatureSelector":
+        self.features_ = features
+        self.corr_ = np.asarray(corr, dtype=np.float64)
+        with stage("linkage"):
+            self.linkage_ = self._linkage(self.corr_)
+        self.fingerprint_ = fingerprint
+        self._selections = {}
+        self._dist = None
+        return self
+
+    @staticmethod
+    def _linkage(corr: np.ndarray) -> np.ndarray:
+        # 3. Full average-linkage dendrogram on the correlation distances
+        if len(corr) < 2:
+            return np.empty((0, 4))
+        return linkage(squareform(correlation_distance(corr), checks=False), method="average")
+
+    def labels(self, n_clusters: Optional[int] = None) -> np.ndarray:
+        """Cluster label of each kept feature when the dendrogram is cut into `n_clusters`."""
+        n = len(self.features_)
+        if n_clusters is None:
+            n_clusters = min(20, n // 2)  # heuristic
+        if not 1 <= n_clusters <= n:
+            raise ValueError(f"n_clusters must be between 1 and {n}, got {n_clusters}.")
+        if n < 2:
+            return np.zeros(n, dtype=int)
+        return cut_tree(self.linkage_, n_clusters=n_clusters).ravel()
+
+    @property
+    def dist_(self) -> np.ndarray:
+        """Correlation distance matrix of the kept features, computed once."""
+        if getattr(self, "_dist", None) is None:
+            self._dist = correlation_distance(self.corr_)
+        return self._dist
+
+    def select(self, n_clusters: Optional[int] = None, strategy: str = "first") -> list:
+        """Names of the representative features for `n_clusters` clusters, cached per k.
+
+        `strategy` is "first" (the cluster's first column) or "medoid" (the
+        member with the smallest mean correlation distance to the others).
+        Representatives are listed in column order.
+        """
+        key = (n_clusters, strategy)
+        if key not in self._selections:
+            clusters = self.labels(n_clusters)
+            if strategy == "first":
+                _, picks = np.unique(clusters, return_index=True)
+            elif strategy == "medoid":
+                picks = cluster_medoids(self.dist_, clusters)
+            else:
+                raise ValueError(f"Unknown strategy '{strategy}', expected 'first' or 'medoid'.")
+            self._selections[key] = [self.features_[i] for i in np.sort(picks)]
+        return self._selections[key]
+
+    def transform(self, X: pd.DataFrame, n_clusters: Optional[int] = None,
+                  strategy: str = "first") -> pd.DataFrame:
+        """Project `X` onto the selected features (a column selection, O(n))."""
+        return X[self.select(n_clusters, strategy)]
+
+    def fit_transform(self, X: pd.DataFrame, n_clusters: Optional[int] = None,
+                      strategy: str = "first") -> pd.DataFrame:
+        return self.fit(X).transform(X, n_clusters, strategy)
+
+    def matches(self, X: pd.DataFrame) -> bool:
+        """True if `X` is the data this selector was fitted on."""
+        return frame_fingerprint(X) == self.fingerprint_
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            params=np.array([self.var_threshold, self.corr_threshold,
+                             -1 if self.block_size is None else self.block_size]),
+            columns=np.array(self.columns_, dtype=str),
+            variance_mask=self.variance_mask_,
+            features=np.array(self.features_, dtype=str),
+            corr=self.corr_,
+            linkage=self.linkage_,
+            fingerprint=np.array(self.fingerprint_),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureSelector":
+        with np.load(path) as data:
+            var_threshold, corr_threshold, block_size = data["params"]
+            self = cls(float(var_threshold), float(corr_threshold),
+                       None if block_size < 0 else int(block_size))
+            self.columns_ = data["columns"].tolist()
+            self.variance_mask_ = data["variance_mask"]
+            self.features_ = data["features"].tolist()
+            self.corr_ = data["corr"]
+            self.linkage_ = data["linkage"]
+            self.fingerprint_ = str(data["fingerprint"])
+        self._selections = {}
+        self._dist = None
+        return self
+
+
+@timed("analyze_features")
+def analyze_features(X: pd.DataFrame, n_clusters: int = 3,
+                     block_size: Optional[int] = None, strategy: str = "first") -> pd.DataFrame:
+    """Select `n_clusters` representative features; see `FeatureSelector`."""
+    return FeatureSelector(block_size=block_size).fit_transform(X, n_clusters, strategy)
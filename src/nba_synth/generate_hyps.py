@@ -1,20 +1,45 @@
+import numpy as np
 import pandas as pd
 
-def generate_hyps(df: pd.DataFrame) -> pd.DataFrame:
-    """Generate hypothesis features from synthetic data."""
-    conj_df = df.copy()
-    
-    # add new 'category' boolean columns
-    # for columns with len(df[col].unique()) <= (len(df))**1/4
-    n = len(conj_df) ** 1/4
-    
-    numeric_cols = conj_df.select_dtypes(include=['number']).columns.tolist()
-    boolean_cols = conj_df.select_dtypes(include=['bool']).columns.tolist()
-
-    for col in numeric_cols:
-        if len(conj_df[col].unique()) <= n:
-            for val in conj_df[col].unique():
-                conj_df[f'{col}_is_{val}'] = (conj_df[col] == val).astype(bool)
-                boolean_cols += [f'{col}_is_{val}']
-    
-    return conj_df
+from typing import Tuple
+from .telemetry import timed
+
+@timed("generate_hyps")
+def generate_hyps(df: pd.DataFrame) -> Tuple[pd.DataFrame, list]:
+    """Generate hypothesis features from synthetic data.
+
+    Every numeric column with at most n**(1/4) distinct values (n = number
+    of rows) gets one `{col}_is_{val}` indicator per value. All indicators
+    are built as a single bool block and joined to `df` once.
+
+    Returns the extended DataFrame and the list of boolean columns (the
+    existing ones followed by the new indicators).
+    """
+    n = len(df) ** 0.25
+
+    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    boolean_cols = df.select_dtypes(include=['bool']).columns.tolist()
+
+    counts = df[numeric_cols].nunique()
+    categorical = counts.index[counts <= n].tolist()
+
+    codes, names = [], []
+    for col in categorical:
+        # values in order of first appearance, NaN gets code -1 (no indicator)
+        col_codes, uniques = pd.factorize(df[col])
+        codes.append((col_codes, len(uniques)))
+        names += [f'{col}_is_{val}' for val in uniques]
+
+    # one-hot: column offset of each value, then a single scatter into the block
+    block = np.zeros((len(df), len(names)), dtype=bool)
+    offset = 0
+    for col_codes, k in codes:
+        present = col_codes >= 0
+        block[np.flatnonzero(present), offset + col_codes[present]] = True
+        offset += k
+
+    hyps = pd.DataFrame(block, columns=names, index=df.index)
+    conj_df = pd.concat([df.drop(columns=[c for c in names if c in df.columns]), hyps], axis=1)
+    boolean_cols = [c for c in boolean_cols if c not in names] + names
+
+    return conj_df, boolean_cols
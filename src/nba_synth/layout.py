@@ -0,0 +1,156 @@
+import re
+import numpy as np
+import pandas as pd
+
+from typing import Iterable, Optional
+
+from .synthetic import split_stats, quarters, teams
+
+_QUARTER_COL = re.compile(r'^(Q[1-4])_(home|away)_(.+)$')
+
+# game-level columns, in the order synthesize_quarters emits them
+GAME_COLUMNS = ['replica_id', 'season_id', 'game_id', 'game_date', 'matchup', 'home_win', 'away_win']
+ID_LEVELS = ['replica_id', 'game_id']
+
+
+def parse_quarter_column(col: str):
+    """Split a wide column name into (quarter, team, stat), or None if it is not one."""
+    m = _QUARTER_COL.match(col)
+    return m.groups() if m else None
+
+
+def wide_quarter_columns() -> list:
+    """Quarter column names in the order synthesize_quarters lays them out."""
+    cols = []
+    for team in teams:
+        for stat, made_stat in split_stats.items():
+            for q in quarters:
+                names = [f'{q}_{team}_{stat}']
+                if made_stat:
+                    names += [f'{q}_{team}_{made_stat}', f'{q}_{team}_{stat[:2]}_pct']
+                cols += [c for c in names if c not in cols]
+        cols += [f'{q}_{team}_pts' for q in quarters]
+    return cols
+
+
+def drop_quarters(columns: Iterable[str], drop: Iterable[str]) -> list:
+    """Keep every column except the per-quarter ones for the quarters in `drop`."""
+    drop = set(drop)
+    out = []
+    for col in columns:
+        parsed = parse_quarter_column(col)
+        if parsed is None or parsed[0] not in drop:
+            out.append(col)
+    return out
+
+
+def wide_to_long(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the wide `{Q}_{team}_{stat}` layout to one row per (game, team, quarter).
+
+    The result is indexed by (`replica_id`,) `game_id`, `team`, `quarter`,
+    with one column per stat; game-level columns are repeated on each row
+    (cheap, since they are categorical or narrow). Stats missing for some
+    (team, quarter) pair are filled with NaN.
+    """
+    parsed = {}
+    stats = []
+    for col in df.columns:
+        p = parse_quarter_column(col)
+        if p is None:
+            continue
+        parsed[p] = col
+        if p[2] not in stats:
+            stats.append(p[2])
+
+    id_cols = [c for c in ID_LEVELS if c in df.columns]
+    meta_cols = [c for c in df.columns if parse_quarter_column(c) is None and c not in id_cols]
+    n, per_game = len(df), len(teams) * len(quarters)
+    take = np.repeat(np.arange(n), per_game)
+
+    team_codes = np.tile(np.repeat(np.arange(len(teams)), len(quarters)), n)
+    quarter_codes = np.tile(np.arange(len(quarters)), n * len(teams))
+    index = pd.MultiIndex.from_arrays(
+        [df[c].to_numpy()[take] for c in id_cols]
+        + [pd.Categorical.from_codes(team_codes, teams), pd.Categorical.from_codes(quarter_codes, quarters)],
+        names=id_cols + ['team', 'quarter'],
+    )
+
+    out = {c: df[c].take(take).array for c in meta_cols}
+    for stat in stats:
+        cols = [parsed.get((q, t, stat)) for t in teams for q in quarters]
+        if all(c is not None for c in cols):
+            block = np.stack([df[c].to_numpy() for c in cols], axis=1)
+        else:
+            block = np.stack([df[c].to_numpy(dtype=np.float64, na_value=np.nan) if c is not None
+                              else np.full(n, np.nan) for c in cols], axis=1)
+        out[stat] = block.reshape(-1)
+    return pd.DataFrame(out, index=index)
+
+
+def _is_blocked(index: pd.MultiIndex) -> bool:
+    """True if rows come in complete (team, quarter) blocks in canonical order."""
+    per_game = len(teams) * len(quarters)
+    if len(index) % per_game:
+        return False
+    n = len(index) // per_game
+    for level, order, pattern in (('team', teams, np.repeat(np.arange(len(teams)), len(quarters))),
+                                  ('quarter', quarters, np.tile(np.arange(len(quarters)), len(teams)))):
+        i = index.names.index(level)
+        lookup = np.array([order.index(v) if v in order else -1 for v in index.levels[i]])
+        if not np.array_equal(lookup[index.codes[i]], np.tile(pattern, n)):
+            return False
+    return True
+
+
+def long_to_wide(long: pd.DataFrame) -> pd.DataFrame:
+    """Inverse of `wide_to_long`, restoring the synthesizer's wide column order.
+
+    Tables produced by `wide_to_long` are reshaped without copying through
+    pandas' stacking machinery; other row orders are sorted first.
+    """
+    index = long.index
+    per_game = len(teams) * len(quarters)
+    if not _is_blocked(index):
+        keys = [pd.Categorical(index.get_level_values('quarter'), quarters).codes,
+                pd.Categorical(index.get_level_values('team'), teams).codes]
+        keys += [pd.factorize(index.get_level_values(lvl))[0]
+                 for lvl in reversed(index.names) if lvl not in ('team', 'quarter')]
+        long = long.iloc[np.lexsort(keys)]
+        index = long.index
+        if not _is_blocked(index):
+            raise ValueError("Long table must have one row per team and quarter for every game.")
+
+    n = len(long) // per_game
+    first = np.arange(n) * per_game
+    id_cols = [lvl for lvl in index.names if lvl not in ('team', 'quarter')]
+    stat_cols = [c for c in long.columns if c not in GAME_COLUMNS]
+    meta_cols = [c for c in long.columns if c in GAME_COLUMNS]
+
+    game = {c: index.get_level_values(c)[first] for c in id_cols}
+    game.update({c: long[c].iloc[first].array for c in meta_cols})
+    quarter_data = {}
+    for stat in stat_cols:
+        block = long[stat].to_numpy().reshape(n, len(teams), len(quarters))
+        for t_i, t in enumerate(teams):
+            for q_i, q in enumerate(quarters):
+                quarter_data[f'{q}_{t}_{stat}'] = block[:, t_i, q_i]
+
+    ordered = [c for c in GAME_COLUMNS if c in game] + [c for c in game if c not in GAME_COLUMNS]
+    canonical = wide_quarter_columns()
+    ordered_q = [c for c in canonical if c in quarter_data] + [c for c in quarter_data if c not in canonical]
+    wide = {c: game[c] for c in ordered}
+    wide.update({c: quarter_data[c] for c in ordered_q})
+    return pd.DataFrame(wide)
+
+
+def select_quarters(long: pd.DataFrame, quarters: Optional[Iterable[str]] = None,
+                    teams: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Indexed selection of quarters and/or teams from a long-format table."""
+    mask = np.ones(len(long), dtype=bool)
+    for level, wanted in (('quarter', quarters), ('team', teams)):
+        if wanted is None:
+            continue
+        i = long.index.names.index(level)
+        codes = long.index.levels[i].get_indexer(list(wanted))
+        mask &= np.isin(long.index.codes[i], codes[codes >= 0])
+    return long[mask]
@@ -0,0 +1,223 @@
+import copy
+import hashlib
+import json
+import os
+import pandas as pd
+
+from typing import Optional
+from .schema import SCHEMA_VERSION
+from .store import file_digest, _has_pyarrow, _read_store, _write_store
+
+# Bump when a stage's code changes in a way that alters its output.
+PIPELINE_VERSION = 1
+
+STAGES = ["synthesize", "features", "hypotheses", "conjectures"]
+
+DEFAULT_CONFIG = {
+    "input": "data/games.csv",
+    "cache_dir": os.path.join("data", ".pipeline"),
+    "synthesize": {"seed": 0},
+    "features": {"n_clusters": 10, "strategy": "medoid", "quarters": None,
+                 "var_threshold": 0.01, "corr_threshold": 0.9},
+    "hypotheses": {"enabled": True},
+    "conjectures": {"targets": None, "prune": True, "top_m": None, "coreset": False,
+                    "workers": None, "timeout": None},
+}
+
+# Parameters that change how a stage runs but not what it produces; left out of its key.
+RUNTIME_PARAMS = {"conjectures": {"workers", "timeout"}}
+
+ID_COLUMNS = ['replica_id', 'season_id', 'game_id']
+
+
+def load_config(path: str) -> dict:
+    """Read a YAML pipeline config and fill in defaults for missing keys."""
+    import yaml
+
+    with open(path) as f:
+        config = yaml.safe_load(f) or {}
+    return merge_config(config)
+
+
+def merge_config(config: dict) -> dict:
+    merged = copy.deepcopy(DEFAULT_CONFIG)
+    for key, value in config.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key].update(value)
+        else:
+            merged[key] = value
+    unknown = set(config) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+    return merged
+
+
+def stage_key(stage: str, params: dict, upstream: str) -> str:
+    """Content address of a stage output: its parameters plus the key of its input."""
+    payload = {"stage": stage, "params": params, "upstream": upstream, "version": PIPELINE_VERSION}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _key_params(stage: str, params: dict) -> dict:
+    runtime = RUNTIME_PARAMS.get(stage, set())
+    return {k: v for k, v in params.items() if k not in runtime}
+
+
+def _frame_ext() -> str:
+    return "parquet" if _has_pyarrow() else "pkl"
+
+
+class _Stage:
+    """One cached stage output under `cache_dir/<stage>/<key>.<ext>`."""
+
+    def __init__(self, cache_dir: str, name: str, key: str, ext: str):
+        self.name = name
+        self.key = key
+        self.path = os.path.join(cache_dir, name, f"{key[:16]}.{ext}")
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def write_frame(self, df: pd.DataFrame, extra: Optional[dict] = None):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_store(df, self.path)
+        if extra is not None:
+            with open(self.path + ".json", "w") as f:
+                json.dump(extra, f)
+
+    def read_extra(self) -> Optional[dict]:
+        """The stage's JSON sidecar, without loading its frame."""
+        if not os.path.exists(self.path + ".json"):
+            return None
+        with open(self.path + ".json") as f:
+            return json.load(f)
+
+    def read_frame(self) -> pd.DataFrame:
+        return _read_store(self.path)
+
+
+def _synthesize(df: pd.DataFrame, params: dict) -> pd.DataFrame:
+    from .synthetic import synthesize_quarters
+
+    return synthesize_quarters(df, seed=params["seed"], output=None)
+
+
+def _features(df: pd.DataFrame, params: dict):
+    from .features import FeatureSelector
+    from .layout import drop_quarters
+
+    numeric = [c for c in df.select_dtypes(include=['number']).columns if c not in ID_COLUMNS]
+    if params["quarters"]:
+        numeric = drop_quarters(numeric, [q for q in ['Q1', 'Q2', 'Q3', 'Q4'] if q not in params["quarters"]])
+    clean = df.dropna(axis=1)
+    numeric = [c for c in numeric if c in clean.columns]
+    selector = FeatureSelector(var_threshold=params["var_threshold"],
+                               corr_threshold=params["corr_threshold"]).fit(clean[numeric])
+    features = selector.select(params["n_clusters"], params["strategy"])
+    boolean_cols = clean.select_dtypes(include=['bool']).columns.tolist()
+    return clean[features + boolean_cols], features, boolean_cols
+
+
+def _conjectures(df: pd.DataFrame, features: list, hyps: list, params: dict) -> dict:
+    from .conjectures import generate_conjectures_batch
+
+    targets = params["targets"] or features
+    results = {}
+    for target, conjs in generate_conjectures_batch(df, features, targets, hyps,
+                                                    workers=params["workers"], timeout=params["timeout"],
+                                                    prune=params["prune"], top_m=params["top_m"],
+                                                    coreset=params["coreset"]):
+        results[target] = conjs
+    return {t: results[t] for t in targets}
+
+
+def _hypotheses(df: pd.DataFrame, boolean_cols: list, params: dict):
+    if not params["enabled"]:
+        return df, boolean_cols
+    from .generate_hyps import generate_hyps
+
+    return generate_hyps(df)
+
+
+def run_pipeline(config: dict, force: bool = False, log=print) -> dict:
+    """Run synthesize -> features -> hypotheses -> conjectures headlessly.
+
+    Each stage's output is stored under a hash of its parameters and its
+    input's key, the first input being the content of `config["input"]`.
+    Keys are computed up front; the pipeline resumes from the first stage
+    without a stored output, loading only the output just before it. So
+    changing one parameter recomputes that stage and those after it
+    (`RUNTIME_PARAMS` such as workers and timeout are not part of a key).
+    The conjectures are only stored when every target succeeded, so a
+    failed or timed-out target is retried on the next run. `force`
+    recomputes everything.
+
+    Returns a dict mapping each stage to `{"key", "path", "cached"}` (path
+    None when the output was not stored), plus the conjectures per target
+    under `"results"`.
+    """
+    import cloudpickle
+
+    config = merge_config(config)
+    cache_dir = config["cache_dir"]
+    if config["synthesize"]["seed"] is None:
+        from .sharding import _resolve_seed
+
+        # an unseeded run is never reused; recording the drawn seed keeps it reproducible
+        config["synthesize"]["seed"] = _resolve_seed(None)
+
+    upstream = stage_key("input", {"schema_version": SCHEMA_VERSION}, file_digest(config["input"]))
+    stages = []
+    for name in STAGES:
+        upstream = stage_key(name, _key_params(name, config[name]), upstream)
+        stages.append(_Stage(cache_dir, name, upstream, "conj.pkl" if name == "conjectures" else _frame_ext()))
+    by_name = dict(zip(STAGES, stages))
+
+    first = 0 if force else next((i for i, st in enumerate(stages) if not st.exists()), len(stages))
+
+    summary = {}
+    for i, stage in enumerate(stages):
+        summary[stage.name] = {"key": stage.key, "path": stage.path, "cached": i < first}
+        log(f"{stage.name:<12} {'cached' if i < first else 'computed'}  {stage.path}")
+
+    if first == len(stages):
+        with open(by_name["conjectures"].path, "rb") as f:
+            summary["results"] = cloudpickle.load(f)
+        return summary
+
+    # outputs of the stage just before `first`
+    if first == 0:
+        from .store import load_dataset
+
+        df = load_dataset(config["input"])
+    else:
+        df = stages[first - 1].read_frame()
+    if first >= 2:
+        extra = by_name["features"].read_extra()
+        features, boolean_cols = extra["features"], extra["boolean_cols"]
+    if first == 3:
+        hyps = by_name["hypotheses"].read_extra()["boolean_cols"]
+
+    for stage in stages[first:]:
+        if stage.name == "synthesize":
+            df = _synthesize(df, config["synthesize"])
+            stage.write_frame(df)
+        elif stage.name == "features":
+            df, features, boolean_cols = _features(df, config["features"])
+            stage.write_frame(df, {"features": features, "boolean_cols": boolean_cols})
+        elif stage.name == "hypotheses":
+            df, hyps = _hypotheses(df, boolean_cols, config["hypotheses"])
+            stage.write_frame(df, {"boolean_cols": hyps})
+        else:
+            results = _conjectures(df, features, hyps, config["conjectures"])
+            failed = [t for t, conjs in results.items() if isinstance(conjs, Exception)]
+            if failed:
+                summary[stage.name]["path"] = None
+                log(f"{stage.name:<12} not stored, {len(failed)} target(s) failed: {', '.join(failed)}")
+                continue
+            os.makedirs(os.path.dirname(stage.path), exist_ok=True)
+            with open(stage.path, "wb") as f:
+                cloudpickle.dump(results, f)
+
+    summary["results"] = results
+    return summary
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from typing import Optional, Tuple
+from .telemetry import timed
+
+
+def _hypothesis_support(df: pd.DataFrame, hyps: list) -> np.ndarray:
+    if not hyps:
+        return np.zeros(0)
+    return df[hyps].to_numpy(dtype=bool).mean(axis=0)
+
+
+def _independent_columns(corr: np.ndarray, tol: float) -> np.ndarray:
+    """Greedy mask of columns not in the affine span of earlier kept columns.
+
+    Works on the correlation matrix of centered columns (so the intercept is
+    already accounted for) with an incrementally grown Cholesky factor: a
+    column is kept when its residual variance after regressing on the kept
+    columns exceeds `tol`.
+    """
+    from scipy.linalg import solve_triangular
+
+    p = len(corr)
+    keep = np.zeros(p, dtype=bool)
+    L = np.zeros((p, p))
+    kept = []
+    for j in range(p):
+        k = len(kept)
+        c = corr[kept, j]
+        w = solve_triangular(L[:k, :k], c, lower=True, check_finite=False) if k else c
+        resid = corr[j, j] - w @ w
+        if resid > tol:
+            L[k, :k], L[k, k] = w, np.sqrt(resid)
+            kept.append(j)
+            keep[j] = True
+    return keep
+
+
+@timed("prune_search_space")
+def prune_search_space(df: pd.DataFrame, feats: list, targ: str, hyps: list,
+                       top_m: Optional[int] = None, min_support: float = 0.01,
+                       max_support: float = 0.99, tol: float = 1e-9) -> Tuple[list, list, dict]:
+    """Shrink the feature and hypothesis lists before calling txgraffiti.
+
+    Removes, in order:
+      - constant features,
+      - exact duplicates (|r| = 1 with an earlier feature) and features that
+        are an affine combination of earlier features,
+      - hypotheses true on fewer than `min_support` or more than
+        `max_support` of the rows,
+    then keeps the `top_m` features most correlated (|r|) with `targ`.
+
+    Returns `(feats, hyps, report)`, where `report` maps each reason to the
+    names removed for it.
+    """
+    report = {"constant": [], "duplicate": [], "affine": [], "low_relevance": [],
+              "rare_hypothesis": [], "common_hypothesis": []}
+    feats = [f for f in feats if f != targ]
+
+    if feats:
+        X = df[feats].to_numpy(dtype=np.float64)
+        centered = X - X.mean(axis=0)
+        norms = np.sqrt((centered ** 2).sum(axis=0))
+
+        constant = norms <= tol * max(1.0, float(np.abs(X).max(initial=0)))
+        report["constant"] = [f for f, c in zip(feats, constant) if c]
+        feats = [f for f, c in zip(feats, constant) if not c]
+        Z = centered[:, ~constant] / norms[~constant]
+        corr = Z.T @ Z
+
+        # pairwise duplicates first, so they are reported as such
+        earlier = np.triu(np.abs(corr) >= 1 - tol, k=1)
+        duplicate = earlier.any(axis=0)
+        report["duplicate"] = [f for f, d in zip(feats, duplicate) if d]
+        keep = ~duplicate
+        corr = corr[np.ix_(keep, keep)]
+        feats = [f for f, k in zip(feats, keep) if k]
+
+        independent = _independent_columns(corr, tol=1e-6)
+        report["affine"] = [f for f, k in zip(feats, independent) if not k]
+        feats = [f for f, k in zip(feats, independent) if k]
+        Z = Z[:, keep][:, independent]
+
+        if top_m is not None and len(feats) > top_m:
+            y = df[targ].to_numpy(dtype=np.float64)
+            y = y - y.mean()
+            y_norm = np.sqrt(y @ y)
+            relevance = np.abs(Z.T @ y) / y_norm if y_norm > 0 else np.zeros(len(feats))
+            ranked = np.argsort(-relevance, kind="stable")
+            top = np.zeros(len(feats), dtype=bool)
+            top[ranked[:top_m]] = True
+            report["low_relevance"] = [f for f, t in zip(feats, top) if not t]
+            feats = [f for f, t in zip(feats, top) if t]
+
+    support = _hypothesis_support(df, hyps)
+    report["rare_hypothesis"] = [h for h, s in zip(hyps, support) if s < min_support]
+    report["common_hypothesis"] = [h for h, s in zip(hyps, support) if s > max_support]
+    hyps = [h for h, s in zip(hyps, support) if min_support <= s <= max_support]
+
+    return feats, hyps, report
+
+
+def _extreme_rows(points: np.ndarray, n_directions: int, rng: np.random.Generator) -> np.ndarray:
+    """Positions of rows that are extreme points of `points`' convex hull.
+
+    Low-dimensional clouds use the exact hull (qhull). Otherwise, and when
+    qhull rejects a degenerate cloud, the hull is approximated by the
+    maximizers of the projections onto both directions of every axis plus
+    `n_directions` random directions.
+    """
+    n, d = points.shape
+    if n <= d + 1:
+        return np.arange(n)
+    span = points.std(axis=0)
+    Z = (points - points.mean(axis=0)) / np.where(span > 0, span, 1.0)
+    if d <= 6:
+        from scipy.spatial import ConvexHull, QhullError
+
+        try:
+            return np.unique(ConvexHull(Z).vertices)
+        except (QhullError, ValueError):
+            pass
+    directions = np.vstack([np.eye(d), -np.eye(d), rng.standard_normal((n_directions, d))])
+    return np.unique((Z @ directions.T).argmax(axis=0))
+
+
+@timed("conjecture_coreset")
+def conjecture_coreset(df: pd.DataFrame, feats: list, targ: str, hyps: list,
+                       sample_per_hyp: int = 500, n_directions: int = 64,
+                       seed: int = 0) -> pd.DataFrame:
+    """Small subset of `df` on which to solve the conjecture LPs.
+
+    For every hypothesis, the rows where it holds contribute the extreme
+    points of their (features, target) cloud plus a uniform sample of up to
+    `sample_per_hyp` rows. Bounds found on the coreset are not guaranteed
+    to hold on `df`; callers must verify them on the full table.
+    """
+    rng = np.random.default_rng(seed)
+    points = df[list(feats) + [targ]].to_numpy(dtype=np.float64)
+    masks = df[hyps].to_numpy(dtype=bool) if hyps else np.ones((len(df), 1), dtype=bool)
+
+    chosen = np.zeros(len(df), dtype=bool)
+    for mask in masks.T:
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            continue
+        chosen[rows[_extreme_rows(points[rows], n_directions, rng)]] = True
+        if len(rows) > sample_per_hyp:
+            rows = rng.choice(rows, size=sample_per_hyp, replace=False)
+        chosen[rows] = True
+    return df[chosen]
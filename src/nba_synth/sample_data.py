@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from typing import Optional
+
+TEAMS = [
+    ('ATL', 'Atlanta Hawks'), ('BOS', 'Boston Celtics'), ('BKN', 'Brooklyn Nets'),
+    ('CHA', 'Charlotte Hornets'), ('CHI', 'Chicago Bulls'), ('CLE', 'Cleveland Cavaliers'),
+    ('DAL', 'Dallas Mavericks'), ('DEN', 'Denver Nuggets'), ('DET', 'Detroit Pistons'),
+    ('GSW', 'Golden State Warriors'), ('HOU', 'Houston Rockets'), ('IND', 'Indiana Pacers'),
+    ('LAC', 'LA Clippers'), ('LAL', 'Los Angeles Lakers'), ('MEM', 'Memphis Grizzlies'),
+    ('MIA', 'Miami Heat'), ('MIL', 'Milwaukee Bucks'), ('MIN', 'Minnesota Timberwolves'),
+    ('NOP', 'New Orleans Pelicans'), ('NYK', 'New York Knicks'), ('OKC', 'Oklahoma City Thunder'),
+    ('ORL', 'Orlando Magic'), ('PHI', 'Philadelphia 76ers'), ('PHX', 'Phoenix Suns'),
+    ('POR', 'Portland Trail Blazers'), ('SAC', 'Sacramento Kings'), ('SAS', 'San Antonio Spurs'),
+    ('TOR', 'Toronto Raptors'), ('UTA', 'Utah Jazz'), ('WAS', 'Washington Wizards'),
+]
+
+# per-team means of the count stats drawn independently of shooting
+_COUNT_MEANS = {'oreb': 11.0, 'dreb': 33.0, 'ast': 23.0, 'stl': 8.0, 'blk': 5.0, 'tov': 14.0, 'pf': 21.0}
+
+
+def _team_stats(rng: np.random.Generator, n: int, minutes: np.ndarray) -> dict:
+    """Box-score totals for one side, internally consistent (made <= attempted, pts from makes)."""
+    pace = minutes / 240.0
+    fga = rng.poisson(85 * pace)
+    fg3a = rng.binomial(fga, rng.uniform(0.15, 0.45, n))
+    fg3m = rng.binomial(fg3a, 0.35)
+    fg2m = rng.binomial(fga - fg3a, 0.50)
+    fta = rng.poisson(23 * pace)
+    ftm = rng.binomial(fta, 0.76)
+    fgm = fg2m + fg3m
+
+    stats = {'fgm': fgm, 'fga': fga, 'fg_pct': fgm / np.maximum(fga, 1),
+             'fg3m': fg3m, 'fg3a': fg3a, 'fg3_pct': np.where(fg3a > 0, fg3m / np.maximum(fg3a, 1), np.nan),
+             'ftm': ftm, 'fta': fta, 'ft_pct': np.where(fta > 0, ftm / np.maximum(fta, 1), np.nan)}
+    counts = {stat: rng.poisson(mean * pace) for stat, mean in _COUNT_MEANS.items()}
+    stats.update(oreb=counts['oreb'], dreb=counts['dreb'], reb=counts['oreb'] + counts['dreb'])
+    stats.update({stat: counts[stat] for stat in ['ast', 'stl', 'blk', 'tov', 'pf']})
+    stats['pts'] = 2 * fgm + fg3m + ftm
+    return stats
+
+
+def make_games(n_games: int, seed: Optional[int] = 0, first_season: int = 1996,
+               missing: float = 0.0) -> pd.DataFrame:
+    """Random table with the column layout of the Kaggle `games.csv`.
+
+    Every game has home and away box scores that respect the basketball
+    identities the synthesizer relies on (makes never exceed attempts,
+    `pts = 2*fgm + fg3m + ftm`, `reb = oreb + dreb`), no ties, and a
+    matching `wl_*` / `plus_minus_*`. Games are spread over seasons of 1230
+    games starting at `first_season`. With `missing > 0`, that fraction of
+    the values in a few stat columns is blanked, as in older seasons of
+    the real file.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_games
+
+    overtime = rng.random(n) < 0.06
+    minutes = np.where(overtime, 265, 240)
+
+    home_team = rng.integers(0, len(TEAMS), n)
+    away_team = (home_team + rng.integers(1, len(TEAMS), n)) % len(TEAMS)
+    abbrev = np.array([a for a, _ in TEAMS])
+    names = np.array([name for _, name in TEAMS])
+
+    season = first_season + np.arange(n) // 1230
+    start = pd.to_datetime(pd.Series(season).astype(str) + '-10-25')
+    game_date = (start + pd.to_timedelta(rng.integers(0, 180, n), unit='D')).dt.strftime('%Y-%m-%d')
+
+    home = _team_stats(rng, n, minutes)
+    away = _team_stats(rng, n, minutes)
+    # break ties with a free throw, keeping pts consistent with the makes
+    tie = home['pts'] == away['pts']
+    home['fta'] = home['fta'] + tie
+    home['ftm'] = home['ftm'] + tie
+    home['ft_pct'] = home['ftm'] / np.maximum(home['fta'], 1)
+    home['pts'] = home['pts'] + tie
+    home_win = home['pts'] > away['pts']
+
+    df = {
+        'season_id': 20000 + season,
+        'team_id_home': 1610612737 + home_team,
+        'team_abbreviation_home': abbrev[home_team],
+        'team_name_home': names[home_team],
+        'game_id': 20000000 + np.arange(n),
+        'game_date': game_date.to_numpy(),
+        'matchup_home': np.char.add(np.char.add(abbrev[home_team], ' vs. '), abbrev[away_team]),
+        'wl_home': np.where(home_win, 'W', 'L'),
+        'min': minutes,
+    }
+    for stat, values in home.items():
+        df[f'{stat}_home'] = values
+    df['plus_minus_home'] = home['pts'] - away['pts']
+    df['video_available_home'] = (season >= 2013).astype(int)
+    df.update({
+        'team_id_away': 1610612737 + away_team,
+        'team_abbreviation_away': abbrev[away_team],
+        'team_name_away': names[away_team],
+        'matchup_away': np.char.add(np.char.add(abbrev[away_team], ' @ '), abbrev[home_team]),
+        'wl_away': np.where(home_win, 'L', 'W'),
+    })
+    for stat, values in away.items():
+        df[f'{stat}_away'] = values
+    df['plus_minus_away'] = away['pts'] - home['pts']
+    df['video_available_away'] = df['video_available_home']
+    df['season_type'] = np.where(rng.random(n) < 0.07, 'Playoffs', 'Regular Season')
+
+    df = pd.DataFrame(df)
+    if missing > 0:
+        for col in ['oreb_home', 'dreb_home', 'oreb_away', 'dreb_away', 'fg3_pct_home', 'fg3_pct_away']:
+            df.loc[rng.random(n) < missing, col] = np.nan
+    return df
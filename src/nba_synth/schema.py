@@ -0,0 +1,69 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Bump when the rules change so cached stores built with old dtypes are rebuilt.
+SCHEMA_VERSION = 2
+
+_STATS = 'min|fgm|fga|fg3m|fg3a|ftm|fta|oreb|dreb|reb|ast|stl|blk|tov|pf|pts|plus_minus'
+
+# (column-name pattern, target dtype), first match wins. Covers both the
+# per-game `games.csv` table and the wide synthetic quarter table.
+SCHEMA = [
+    (r'^(season_id|game_id|team_id_(home|away))$', 'int32'),
+    (r'^(game_date|matchup|season_type|(team_abbreviation|team_name|matchup|wl)_(home|away))$', 'category'),
+    (r'_pct(_(home|away))?$', 'float32'),
+    (r'^video_available_(home|away)$', 'int8'),
+    (rf'^(min|({_STATS})_(home|away))$', 'int16'),
+    (r'^Q[1-4]_(home|away)_\w+$', 'int16'),
+]
+_COMPILED = [(re.compile(pattern), dtype) for pattern, dtype in SCHEMA]
+
+
+def schema_dtype(col: str):
+    """Target dtype for a column name, or None if the schema does not cover it."""
+    for pattern, dtype in _COMPILED:
+        if pattern.search(col):
+            return dtype
+    return None
+
+
+def _downcast_int(s: pd.Series, dtype: str) -> pd.Series:
+    """Cast to `dtype`, falling back to a wider int or a float when it would lose data.
+
+    The float fallback is float32 only for narrow stat columns whose values
+    it represents exactly (|x| <= 2**24); ids and larger values get float64.
+    """
+    values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    if np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+        exact = np.dtype(dtype).itemsize < 4 and not (np.abs(values) > 2 ** 24).any()
+        return s.astype('float32' if exact else 'float64')
+    lo, hi = (values.min(), values.max()) if len(values) else (0, 0)
+    for candidate in (dtype, 'int16', 'int32', 'int64'):
+        info = np.iinfo(candidate)
+        if np.dtype(candidate).itemsize >= np.dtype(dtype).itemsize and info.min <= lo and hi <= info.max:
+            return s.astype(candidate)
+    return s
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with compact dtypes: downcast ints, float32 percentages, categorical strings.
+
+    Integer columns that contain NaNs or fractional values become floats
+    instead (float64 for ids, see `_downcast_int`). Columns the schema does not cover are left unchanged.
+    """
+    out = {}
+    for col in df.columns:
+        dtype = schema_dtype(col)
+        s = df[col]
+        if dtype is None or s.dtype == dtype:
+            out[col] = s
+        elif dtype == 'category':
+            out[col] = s if pd.api.types.is_numeric_dtype(s) else s.astype('category')
+        elif not pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+            out[col] = s
+        elif dtype == 'float32':
+            out[col] = s.astype('float32')
+        else:
+            out[col] = _downcast_int(s, dtype)
+    return pd.DataFrame(out, index=df.index)
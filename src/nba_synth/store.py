@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import pandas as pd
+
+from collections import OrderedDict
+from typing import Optional
+
+from .schema import SCHEMA_VERSION, apply_schema
+from .telemetry import stage, timed
+
+STORE_DIR = ".store"  # created next to each source CSV
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def file_fingerprint(path: str) -> dict:
+    """Cheap fingerprint of a file: size and modification time."""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _options_key(read_csv_kwargs: dict) -> str:
+    """Short hash of the `read_csv` options a stored copy was parsed with ("" for none)."""
+    if not read_csv_kwargs:
+        return ""
+    payload = json.dumps(read_csv_kwargs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _store_paths(path: str, store_dir: str, compact: bool = True, options: str = ""):
+    name = os.path.splitext(os.path.basename(path))[0] + ("" if compact else ".raw")
+    if options:
+        name += "." + options
+    ext = ".parquet" if _has_pyarrow() else ".pkl"
+    return os.path.join(store_dir, name + ext), os.path.join(store_dir, name + ".json")
+
+
+def _read_meta(meta_path: str) -> Optional[dict]:
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path: str, meta: dict):
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _read_store(store_path: str) -> pd.DataFrame:
+    if store_path.endswith(".parquet"):
+        return pd.read_parquet(store_path)
+    return pd.read_pickle(store_path)
+
+
+def _write_store(df: pd.DataFrame, store_path: str):
+    tmp = store_path + ".tmp"
+    if store_path.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, store_path)
+
+
+@timed("load_dataset")
+def load_dataset(path: str, store_dir: Optional[str] = None, compact: bool = True,
+                 **read_csv_kwargs) -> pd.DataFrame:
+    """Load a CSV through a typed columnar cache.
+
+    The first load parses the CSV and writes it to `store_dir` (by default a
+    `.store` directory next to the CSV) as Parquet, or as a pickle when
+    pyarrow is not installed, together with a fingerprint of the source.
+    Later loads read the binary copy. Each set of `read_csv_kwargs` gets its
+    own copy, keyed by a hash of the options. The copy is rebuilt when the
+    source's size or contents change; a changed mtime alone only triggers a
+    content hash check.
+
+    With `compact`, the dtype schema from `schema.apply_schema` is applied
+    before the copy is written, so cached loads come back already compact.
+
+    Raises FileNotFoundError if the source CSV does not exist.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    if store_dir is None:
+        store_dir = os.path.join(os.path.dirname(path), STORE_DIR)
+    os.makedirs(store_dir, exist_ok=True)
+    options = _options_key(read_csv_kwargs)
+    store_path, meta_path = _store_paths(path, store_dir, compact, options)
+    fingerprint = file_fingerprint(path)
+    meta = _read_meta(meta_path)
+
+    if (meta is not None and os.path.exists(store_path) and meta.get("source") == os.path.abspath(path)
+            and meta.get("schema_version") == SCHEMA_VERSION and meta.get("options", "") == options):
+        if meta["fingerprint"] == fingerprint:
+            with stage("read_store") as s:
+                return s.frame(_read_store(store_path))
+        if meta["fingerprint"]["size"] == fingerprint["size"] and meta.get("sha256") == file_digest(path):
+            meta["fingerprint"] = fingerprint
+            _write_meta(meta_path, meta)
+            with stage("read_store") as s:
+                return s.frame(_read_store(store_path))
+
+    with stage("read_csv") as s:
+        df = s.frame(pd.read_csv(path, **read_csv_kwargs))
+    if compact:
+        with stage("apply_schema"):
+            df = apply_schema(df)
+    with stage("write_store"):
+        _write_store(df, store_path)
+    _write_meta(meta_path, {
+        "source": os.path.abspath(path),
+        "fingerprint": fingerprint,
+        "sha256": file_digest(path),
+        "schema_version": SCHEMA_VERSION,
+        "options": options,
+        "rows": len(df),
+        "columns": len(df.columns),
+    })
+    return df
+
+
+ID_COLUMNS = ['season_id', 'game_id']
+
+
+class DatasetEntry:
+    """A loaded dataset plus the derived views the CLI asks for repeatedly."""
+
+    def __init__(self, path: str, df: pd.DataFrame, mtime_ns: int):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.df = df
+        # remove columns with NaN values
+        with stage("dropna") as s:
+            self.clean = s.frame(df.dropna(axis=1))
+        with stage("select_dtypes"):
+            self.numeric_cols = self.clean.select_dtypes(include=['number']).columns.tolist()
+            self.boolean_cols = self.clean.select_dtypes(include=['bool']).columns.tolist()
+        self.features = [col for col in self.numeric_cols if col not in ID_COLUMNS]
+        # fitted FeatureSelectors keyed by feature tuple; evicted with the entry
+        self.selectors = {}
+        self.nbytes = int(df.memory_usage(deep=True).sum() + self.clean.memory_usage(deep=True).sum())
+
+
+class DatasetCache:
+    """Session-level LRU cache of `DatasetEntry` objects, bounded by memory.
+
+    Entries are keyed by path and invalidated when the file's mtime changes.
+    The least recently used entries are evicted once the total footprint
+    exceeds `max_bytes`; the most recent entry is always kept.
+    """
+
+    def __init__(self, max_bytes: int = 2 * 1024**3):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+
+    def get(self, path: str) -> DatasetEntry:
+        """Return the entry for `path`, loading it if missing or stale.
+
+        Raises FileNotFoundError if `path` does not exist.
+        """
+        if not os.path.exists(path):
+            self.evict(path)
+            raise FileNotFoundError(path)
+
+        key = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            self._entries.move_to_end(key)
+        else:
+            self.evict(path)
+            entry = DatasetEntry(path, load_dataset(path), mtime_ns)
+            self._entries[key] = entry
+            self._nbytes += entry.nbytes
+
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._nbytes -= old.nbytes
+        return entry
+
+    def evict(self, path: str):
+        """Drop the cached entry for `path`, if any."""
+        entry = self._entries.pop(os.path.abspath(path), None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def clear(self):
+        self._entries.clear()
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path: str):
+        return os.path.abspath(path) in self._entries
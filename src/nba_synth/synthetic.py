@@ -2,6 +2,13 @@
 import pandas as pd
 import numpy as np
 
+from typing import Optional, Union
+
+from .schema import apply_schema
+from .telemetry import timed
+
+SeedLike = Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+
 # Stats to split by quarter (grouped for percentages)
 # Note: we removed 'pts' since it will be derived
 split_stats = {
@@ -18,14 +25,16 @@ split_stats = {
 }
 
 quarters = ['Q1', 'Q2', 'Q3', 'Q4']
+teams = ['home', 'away']
 
 
-def split_total(value, n=4):
+def split_total(value, n=4, rng=None):
     """Split a total integer value across n parts using Dirichlet proportions (rounded)."""
+    rng = np.random if rng is None else rng
     if pd.isna(value) or value == 0:
         return [0] * n
     value = int(round(value))  # ensure integer
-    proportions = np.random.dirichlet(np.ones(n), size=1)[0]
+    proportions = rng.dirichlet(np.ones(n), size=1)[0]
     split = np.floor(proportions * value).astype(int)
     diff = value - split.sum()
     for i in range(abs(diff)):
@@ -33,19 +42,20 @@ def split_total(value, n=4):
     return split.tolist()
 
 
-def split_attempts_and_made(attempts_total, made_total):
+def split_attempts_and_made(attempts_total, made_total, rng=None):
     """Split attempts first, then allocate made ≤ attempts each quarter."""
+    rng = np.random if rng is None else rng
     attempts_total = int(round(attempts_total)) if not pd.isna(attempts_total) else 0
     made_total = int(round(made_total)) if not pd.isna(made_total) else 0
 
-    attempts_split = split_total(attempts_total, 4)
+    attempts_split = split_total(attempts_total, 4, rng=rng)
 
     if made_total > attempts_total:
         made_total = attempts_total  # safety check
 
     made_split = [0] * 4
     if made_total > 0:
-        proportions = np.random.dirichlet(np.ones(4), size=1)[0]
+        proportions = rng.dirichlet(np.ones(4), size=1)[0]
         raw = np.floor(proportions * made_total).astype(int)
         diff = made_total - raw.sum()
         for i in range(abs(diff)):
@@ -58,7 +68,7 @@ def split_attempts_and_made(attempts_total, made_total):
         # If we clipped too much, redistribute remaining makes
         leftover = made_total - sum(made_split)
         while leftover > 0:
-            for i in np.random.permutation(4):
+            for i in rng.permutation(4):
                 if made_split[i] < attempts_split[i]:
                     made_split[i] += 1
                     leftover -= 1
@@ -67,66 +77,283 @@ def split_attempts_and_made(attempts_total, made_total):
 
     return attempts_split, made_split
 
-def synthesize_quarters(df: pd.DataFrame) -> pd.DataFrame:
-    """Generate synthetic per-quarter stats from per-game stats."""
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix64(x):
+    """SplitMix64 finalizer, applied elementwise to a uint64 array."""
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _root_key(seed: SeedLike) -> np.uint64:
+    """Reduce a seed, SeedSequence or Generator to a single 64-bit root key.
+
+    A `np.uint64` is taken to be a root key already and returned unchanged,
+    so a key computed once in a parent process can be handed to workers.
+    """
+    if isinstance(seed, np.uint64):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        seed = int(seed.integers(0, 2**63))
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return np.uint64(seed.generate_state(1, dtype=np.uint64)[0])
+
+
+def game_keys(game_ids, seed: SeedLike = None) -> np.ndarray:
+    """Derive one independent 64-bit stream key per game.
+
+    Keys depend only on the root seed and the game's `game_id`, never on the
+    row position, so any partition of the games reproduces the same draws.
+    """
+    ids = pd.Series(np.asarray(game_ids))
+    if pd.api.types.is_float_dtype(ids) and ids.notna().all() and (ids == ids.round()).all():
+        ids = ids.astype(np.int64)  # same key whether ids were parsed as int or float
+    ids = pd.util.hash_pandas_object(ids, index=False)
+    with np.errstate(over='ignore'):
+        return _mix64(ids.to_numpy(dtype=np.uint64) ^ _mix64(_root_key(seed) + _GOLDEN))
+
+
+def _uniform(keys, counters):
+    """Counter-based uniforms in (0, 1): one value per (game key, counter) pair.
+
+    `keys` has shape (games,) and `counters` any integer shape; the result has
+    shape (games, *counters.shape).
+    """
+    counters = np.asarray(counters, dtype=np.uint64)
+    return _uniform_pairs(keys.reshape(keys.shape + (1,) * counters.ndim), counters)
+
+
+def _uniform_pairs(keys, counters):
+    """Elementwise (broadcast) version of `_uniform`."""
+    with np.errstate(over='ignore'):
+        bits = _mix64(keys + (counters + np.uint64(1)) * _GOLDEN)
+    return ((bits >> np.uint64(11)).astype(np.float64) + 0.5) * 2.0**-53
+
+
+def _split_counts(totals, proportions):
+    """Vectorized version of the floor-and-fix-up rounding in `split_total`.
+
+    `totals` has shape (...,) and `proportions` has shape (..., 4).
+    """
+    n = proportions.shape[-1]
+    split = np.floor(proportions * totals[..., None]).astype(np.int64)
+    diff = totals - split.sum(axis=-1)
+    # flooring only ever loses mass, so diff is in [0, n) and the fix-up
+    # loop in split_total reduces to "+1 on the first diff parts"
+    split += np.arange(n) < diff[..., None]
+    return split
+
+
+def _dirichlet(keys, counters):
+    """Flat Dirichlet(1, ..., 1) proportions over the last axis of `counters`."""
+    gam = -np.log(_uniform(keys, counters))
+    return gam / gam.sum(axis=-1, keepdims=True)
+
+
+def _redistribute_made(made, attempts, leftover, keys, counters):
+    """Hand out clipped makes one at a time to quarters that still have room.
+
+    Each round draws from its own block of counters so a game's outcome does
+    not depend on how many rounds the other games in the batch needed. Only
+    the (game, team, stat) rows that still have makes left are touched.
+    """
+    n = made.shape[-1]
+    per_game = leftover[0].size if len(leftover) else 1
+    block = np.uint64(counters.size)
+    counters = counters.reshape(-1, n)
+    made = made.reshape(-1, n)
+    attempts = attempts.reshape(-1, n)
+    left = leftover.reshape(-1).copy()
+
+    active = np.flatnonzero(left)
+    rnd = 0
+    while active.size:
+        # random quarter order per row, like np.random.permutation(4)
+        u = _uniform_pairs(keys[active // per_game, None],
+                           counters[active % per_game] + np.uint64(rnd) * block)
+        order = np.argsort(u, axis=-1)
+        room = np.take_along_axis(attempts[active] - made[active], order, axis=-1) > 0
+        give = room & (np.cumsum(room, axis=-1) <= left[active, None])
+        bonus = np.zeros((active.size, n), dtype=made.dtype)
+        np.put_along_axis(bonus, order, give.astype(made.dtype), axis=-1)
+        made[active] += bonus
+        left[active] -= bonus.sum(axis=-1)
+        active = active[left[active] > 0]
+        rnd += 1
+    return made.reshape(leftover.shape + (n,))
+
+
+def _as_counts(df, cols):
+    """Read stat columns as rounded integers, treating missing values as 0."""
+    out = np.zeros((len(df), len(cols)), dtype=np.int64)
+    for j, col in enumerate(cols):
+        if col in df.columns:
+            vals = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            out[:, j] = np.rint(np.nan_to_num(vals, nan=0.0)).astype(np.int64)
+    return out
+
+
+# stat layout shared by the batch engine
+_stats = list(split_stats)
+_paired = [s for s, m in split_stats.items() if m]
+_made_stats = [split_stats[s] for s in _paired]
+_paired_idx = [_stats.index(s) for s in _paired]
+
+
+def _game_totals(df: pd.DataFrame):
+    """Read the per-game (games, teams, stats) attempt and made totals."""
+    attempts_tot = np.stack([_as_counts(df, [f'{s}_{t}' for s in _stats]) for t in teams], axis=1)
+    made_tot = np.stack([_as_counts(df, [f'{m}_{t}' for m in _made_stats]) for t in teams], axis=1)
+    made_tot = np.minimum(made_tot, attempts_tot[..., _paired_idx])  # safety check
+    return attempts_tot, made_tot
+
+
+def _synthesize_batch(attempts_tot: np.ndarray, made_tot: np.ndarray, keys: np.ndarray) -> dict:
+    """Split every (game, team, stat) total into quarters in one NumPy pass.
+
+    `keys` holds one stream key per game (see `game_keys`). Returns the
+    per-quarter arrays keyed by wide column name, in the same column order
+    the row-by-row implementation produced.
+    """
+    n_q = len(quarters)
+
+    # fixed counter layout per game: attempts, then makes, then redistribution rounds
+    att_ctr = np.arange(len(teams) * len(_stats) * n_q, dtype=np.uint64)
+    made_ctr = att_ctr.size + np.arange(len(teams) * len(_paired) * n_q, dtype=np.uint64)
+    redist_ctr = made_ctr + np.uint64(made_ctr.size)
+    att_ctr = att_ctr.reshape(len(teams), len(_stats), n_q)
+    made_ctr = made_ctr.reshape(len(teams), len(_paired), n_q)
+    redist_ctr = redist_ctr.reshape(len(teams), len(_paired), n_q)
+
+    # (games, teams, stats, quarters) splits
+    splits = _split_counts(attempts_tot, _dirichlet(keys, att_ctr))
+    attempts = splits[..., _paired_idx, :]
+    made = np.minimum(_split_counts(made_tot, _dirichlet(keys, made_ctr)), attempts)
+    made = _redistribute_made(made, attempts, made_tot - made.sum(axis=-1), keys, redist_ctr)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = np.where(attempts > 0, np.round(made / attempts, 3), np.nan)
+
+    fgm, fg3m, ftm = (made[..., _made_stats.index(m), :] for m in ('fgm', 'fg3m', 'ftm'))
+    pts = 2 * (fgm - fg3m) + 3 * fg3m + ftm
+
+    columns = {}
+    for t_i, team in enumerate(teams):
+        for s_i, stat in enumerate(_stats):
+            made_stat = split_stats[stat]
+            if made_stat:
+                p_i = _paired.index(stat)
+                for q_i, q in enumerate(quarters):
+                    columns[f'{q}_{team}_{stat}'] = splits[:, t_i, s_i, q_i]
+                    columns[f'{q}_{team}_{made_stat}'] = made[:, t_i, p_i, q_i]
+                    columns[f'{q}_{team}_{stat[:2]}_pct'] = pct[:, t_i, p_i, q_i]
+            else:
+                for q_i, q in enumerate(quarters):
+                    columns[f'{q}_{team}_{stat}'] = splits[:, t_i, s_i, q_i]
+        for q_i, q in enumerate(quarters):
+            columns[f'{q}_{team}_pts'] = pts[:, t_i, q_i]
+    return columns
+
+
+def _check_columns(df: pd.DataFrame):
     # Ensure input DataFrame has necessary columns
     required_cols = ['season_id', 'game_id', 'game_date', 'matchup_home', 'wl_home', 'wl_away']
     for col in required_cols:
         if col not in df.columns:
             raise ValueError(f"Input DataFrame must contain '{col}' column.")
 
-    rows = []
-
-    for _, row in df.iterrows():
-        game_data = {
-            'season_id': row['season_id'],
-            'game_id': row['game_id'],
-            'game_date': row['game_date'],
-            'matchup': row['matchup_home'],
-            'home_win': row['wl_home'] == 'W',
-            'away_win': row['wl_away'] == 'W'
-        }
-
-        for team in ['home', 'away']:
-            for stat, made_stat in split_stats.items():
-                stat_val = row.get(f'{stat}_{team}', 0)
-                stat_val = int(round(stat_val)) if not pd.isna(stat_val) else 0
-
-                if made_stat:  # paired stat, like fgm with fga
-                    made_val = row.get(f'{made_stat}_{team}', 0)
-                    made_val = int(round(made_val)) if not pd.isna(made_val) else 0
-
-                    attempts_split, made_split = split_attempts_and_made(stat_val, made_val)
-
-                    for i, q in enumerate(quarters):
-                        game_data[f'{q}_{team}_{stat}'] = attempts_split[i]
-                        game_data[f'{q}_{team}_{made_stat}'] = made_split[i]
-
-                        pct_name = f'{q}_{team}_{stat[:2]}_pct'
-                        if attempts_split[i] > 0:
-                            game_data[pct_name] = round(made_split[i] / attempts_split[i], 3)
-                        else:
-                            game_data[pct_name] = None
-                else:  # standalone stat
-                    values = split_total(stat_val)
-                    for i, q in enumerate(quarters):
-                        game_data[f'{q}_{team}_{stat}'] = values[i]
-
-            # Now compute points per quarter consistently
-            for i, q in enumerate(quarters):
-                fgm = int(game_data.get(f'{q}_{team}_fgm', 0))
-                fg3m = int(game_data.get(f'{q}_{team}_fg3m', 0))
-                ftm = int(game_data.get(f'{q}_{team}_ftm', 0))
-
-                pts = 2 * (fgm - fg3m) + 3 * fg3m + ftm
-                game_data[f'{q}_{team}_pts'] = pts
-
-        rows.append(game_data)
-
-    # Create the final DataFrame
-    df_synth = pd.DataFrame(rows)
-    
+
+def _game_columns(df: pd.DataFrame) -> dict:
+    return {
+        'season_id': df['season_id'].to_numpy(),
+        'game_id': df['game_id'].to_numpy(),
+        'game_date': df['game_date'].to_numpy(),
+        'matchup': df['matchup_home'].to_numpy(),
+        'home_win': (df['wl_home'] == 'W').to_numpy(),
+        'away_win': (df['wl_away'] == 'W').to_numpy(),
+    }
+
+
+@timed("synthesize_quarters")
+def synthesize_quarters(df: pd.DataFrame, seed: SeedLike = None,
+                        output: Optional[str] = "data/synthetic_quarters.csv",
+                        layout: str = "wide") -> pd.DataFrame:
+    """Generate synthetic per-quarter stats from per-game stats.
+
+    `seed` may be an int, a `np.random.SeedSequence` or a `np.random.Generator`.
+    Every game draws from its own stream keyed by `game_id`, so the same seed
+    gives identical rows however the games are chunked or ordered. With no
+    seed, fresh OS entropy is used.
+
+    The result is also written to `output` as CSV unless `output` is None.
+    With `layout="long"` the table is returned (and written, index included)
+    with one row per game, team and quarter; see `layout.wide_to_long`.
+    """
+    _check_columns(df)
+    if layout not in ("wide", "long"):
+        raise ValueError(f"Unknown layout '{layout}', expected 'wide' or 'long'.")
+
+    keys = game_keys(df['game_id'], seed)
+
+    game_data = _game_columns(df)
+    game_data.update(_synthesize_batch(*_game_totals(df), keys))
+
+    # Create the final DataFrame with the compact dtype schema
+    df_synth = apply_schema(pd.DataFrame(game_data))
+    if layout == "long":
+        from .layout import wide_to_long
+        df_synth = wide_to_long(df_synth)
+
     # save as csv
-    df_synth.to_csv("data/synthetic_quarters.csv", index=False)
-    
-    return df_synth
\ No newline at end of file
+    if output is not None:
+        df_synth.to_csv(output, index=layout == "long")
+
+    return df_synth
+
+
+def replica_keys(keys: np.ndarray, replica: int) -> np.ndarray:
+    """Stream keys for Monte Carlo replica `replica`; replica 0 reuses `keys`."""
+    if replica == 0:
+        return keys
+    with np.errstate(over='ignore'):
+        return _mix64(keys ^ _mix64(np.uint64(replica) * _GOLDEN))
+
+
+def synthesize_replicas(df: pd.DataFrame, replicas: int, seed: SeedLike = None,
+                        output: Optional[str] = None) -> pd.DataFrame:
+    """Generate `replicas` synthetic quarter datasets in one vectorized sweep.
+
+    The source games are parsed once and their totals tiled across replicas,
+    so each extra replica only costs its random draws and array ops. Replica 0
+    is identical to `synthesize_quarters(df, seed)`.
+
+    Returns the replicas stacked with a leading `replica_id` column. If
+    `output` contains `{replica}` one CSV is written per replica, otherwise
+    the stacked frame is written to `output` (when given).
+    """
+    _check_columns(df)
+    if replicas < 1:
+        raise ValueError("replicas must be at least 1.")
+
+    keys = game_keys(df['game_id'], seed)
+    attempts_tot, made_tot = _game_totals(df)
+    n = len(df)
+
+    all_keys = np.concatenate([replica_keys(keys, r) for r in range(replicas)])
+    game_data = {'replica_id': np.repeat(np.arange(replicas), n)}
+    game_data.update({col: np.tile(vals, replicas) for col, vals in _game_columns(df).items()})
+    game_data.update(_synthesize_batch(np.tile(attempts_tot, (replicas, 1, 1)),
+                                       np.tile(made_tot, (replicas, 1, 1)), all_keys))
+    df_synth = apply_schema(pd.DataFrame(game_data))
+
+    if output is not None and '{replica}' in output:
+        for r, part in df_synth.groupby('replica_id', sort=True):
+            part.drop(columns='replica_id').to_csv(output.format(replica=r), index=False)
+    elif output is not None:
+        df_synth.to_csv(output, index=False)
+
+    return df_synth
@@ -0,0 +1,180 @@
+import functools
+import json
+import sys
+import time
+import tracemalloc
+
+from typing import Optional
+
+# Instrumentation is off unless enable() is called; stage() and timed() then
+# cost one flag check.
+_enabled = False
+_memory = False
+_profile_stage = None
+_stack = []
+records = []
+
+
+def enable(memory: bool = False, profile_stage: Optional[str] = None):
+    """Start recording stages.
+
+    With `memory`, tracemalloc is started and each stage records its peak
+    traced allocation. With `profile_stage`, stages of that name run under
+    cProfile ("*" profiles every top-level stage); see `dump_pstats`.
+    """
+    global _enabled, _memory, _profile_stage
+    _enabled, _memory, _profile_stage = True, memory, profile_stage
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    if _memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    records.clear()
+
+
+def _max_rss() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        # Unix only; Windows records no RSS
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class _NullStage:
+    def frame(self, df):
+        return df
+
+
+_NULL = _NullStage()
+
+
+class stage:
+    """Context manager recording one stage: `with stage("read_csv") as s: df = s.frame(...)`.
+
+    `s.frame(df)` records the row/column count of a result and returns it.
+    Stages nest; each record keeps its depth and parent name.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        if not _enabled:
+            return _NULL
+        self.record = {"stage": self.name, "depth": len(_stack),
+                       "parent": _stack[-1].name if _stack else None,
+                       "rows": None, "cols": None}
+        self.child_peak = 0
+        self.profile = None
+        if _memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.outer_peak = peak
+            tracemalloc.reset_peak()
+            self.base = current
+        # cProfile cannot nest, so a stage inside a profiled one is not profiled again
+        if (_profile_stage is not None and not any(st.profile for st in _stack)
+                and (self.name == _profile_stage or (_profile_stage == "*" and not _stack))):
+            import cProfile
+
+            self.profile = cProfile.Profile()
+        _stack.append(self)
+        self.wall, self.cpu = time.perf_counter(), time.process_time()
+        if self.profile is not None:
+            self.profile.enable()
+        return self
+
+    def frame(self, df):
+        shape = getattr(df, "shape", None)
+        if shape is not None:
+            self.record["rows"] = shape[0]
+            self.record["cols"] = shape[1] if len(shape) > 1 else 1
+        return df
+
+    def __exit__(self, exc_type, exc, tb):
+        if not _enabled or not _stack or _stack[-1] is not self:
+            return False
+        if self.profile is not None:
+            self.profile.disable()
+        wall, cpu = time.perf_counter() - self.wall, time.process_time() - self.cpu
+        _stack.pop()
+        self.record.update(wall_s=wall, cpu_s=cpu, max_rss_bytes=_max_rss())
+        if _memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            self.record["peak_bytes"] = peak - self.base
+            if _stack:
+                # tracemalloc keeps a single peak, which __enter__ reset; hand
+                # the enclosing stage the peaks it can no longer see
+                _stack[-1].child_peak = max(_stack[-1].child_peak, peak, self.outer_peak)
+        if exc_type is not None:
+            self.record["error"] = exc_type.__name__
+        if self.profile is not None:
+            self.record["profile"] = self.profile
+        records.append(self.record)
+        return False
+
+
+def timed(name: Optional[str] = None):
+    """Decorator form of `stage`; records the shape of a returned DataFrame."""
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with stage(label) as s:
+                result = fn(*args, **kwargs)
+                s.frame(result[0] if isinstance(result, tuple) and result else result)
+                return result
+        return wrapper
+    return decorator
+
+
+def to_json(path: str):
+    """Write the records (without profiler objects) to `path`."""
+    with open(path, "w") as f:
+        json.dump([{k: v for k, v in r.items() if k != "profile"} for r in records], f, indent=2)
+
+
+def dump_pstats(path: str) -> Optional[str]:
+    """Dump the profile of the slowest profiled stage to `path`; returns its name."""
+    profiled = [r for r in records if "profile" in r]
+    if not profiled:
+        return None
+    hot = max(profiled, key=lambda r: r["wall_s"])
+    hot["profile"].dump_stats(path)
+    return hot["stage"]
+
+
+def summary_table(title: str = "Stage telemetry"):
+    """rich Table of the records, in completion order with nested stages indented."""
+    from rich.table import Table
+
+    table = Table(title=title)
+    for col in ["stage", "wall s", "cpu s", "rows", "cols", "peak MiB", "max RSS MiB"]:
+        table.add_column(col, justify="left" if col == "stage" else "right")
+    for r in records:
+        peak = r.get("peak_bytes")
+        table.add_row(
+            "  " * r["depth"] + r["stage"] + (f" [red]({r['error']})[/red]" if "error" in r else ""),
+            f"{r['wall_s']:.3f}", f"{r['cpu_s']:.3f}",
+            "" if r["rows"] is None else str(r["rows"]),
+            "" if r["cols"] is None else str(r["cols"]),
+            "" if peak is None else f"{peak / 2**20:.1f}",
+            "" if r["max_rss_bytes"] is None else f"{r['max_rss_bytes'] / 2**20:.0f}",
+        )
+    return table
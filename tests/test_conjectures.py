@@ -0,0 +1,49 @@
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+from txgraffiti.generators import optimization
+
+from src.nba_synth import conjectures
+from src.nba_synth.conjectures import generate_conjectures_batch
+from src.nba_synth.sample_data import make_games
+
+# the solver stub is patched in the parent and reaches the workers only by fork
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="needs the fork start method")
+
+
+def _slow_solve(X, y, sense="upper"):
+    # stands in for the LP solve; returns the trivial bound y <= 0 * x + 0
+    time.sleep(2.0)
+    return np.zeros(X.shape[1]), 0.0
+
+
+def _run_slow_batch(monkeypatch):
+    monkeypatch.setattr(optimization, "_solve_sum_slack_lp", _slow_solve)
+    df = make_games(200, seed=1)
+    df["home_win"] = df["wl_home"] == "W"
+    feats = ["fgm_home", "fga_home", "ftm_home"]
+
+    start = time.perf_counter()
+    results = dict(generate_conjectures_batch(df, feats, ["pts_home"], ["home_win"],
+                                              workers=1, timeout=0.5))
+    return results, time.perf_counter() - start
+
+
+def test_batch_timeout_reports_timeout_error(monkeypatch):
+    results, elapsed = _run_slow_batch(monkeypatch)
+
+    assert isinstance(results["pts_home"], TimeoutError)
+    assert elapsed < 1.8
+
+
+def test_batch_timeout_without_sigalrm(monkeypatch):
+    monkeypatch.setattr(conjectures, "_HAS_ALARM", False)
+
+    results, elapsed = _run_slow_batch(monkeypatch)
+
+    assert isinstance(results["pts_home"], TimeoutError)
+    assert elapsed < 1.8
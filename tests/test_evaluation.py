@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from txgraffiti.logic import Conjecture, Predicate, Property
+
+from src.nba_synth.conjectures import verify_conjectures
+from src.nba_synth.evaluation import evaluate_conjectures
+
+
+def _frame():
+    return pd.DataFrame({"x": [1, 2, 3, 4], "y": [1, 2, 3, 5], "h": [True, True, True, True]})
+
+
+def _props():
+    x = Property("x", lambda df: df["x"])
+    y = Property("y", lambda df: df["y"])
+    h = Predicate("h", lambda df: df["h"])
+    return x, y, h
+
+
+def test_equality_violated_in_either_direction():
+    df = _frame()
+    x, y, h = _props()
+    conjs = [Conjecture(h, y == x), Conjecture(h, x == y)]
+
+    result = evaluate_conjectures(conjs, df)
+
+    assert [c.is_true(df) for c in conjs] == [False, False]
+    assert not result["valid"].any()
+    assert list(result["touch"]) == [3, 3]
+    assert verify_conjectures(conjs, df) == []
+
+
+def test_inequalities_match_is_true():
+    df = _frame()
+    x, y, h = _props()
+    conjs = [Conjecture(h, y >= x), Conjecture(h, y <= x), Conjecture(h, y > x), Conjecture(h, y != x)]
+
+    result = evaluate_conjectures(conjs, df)
+
+    assert list(result["valid"]) == [c.is_true(df) for c in conjs]
+    assert list(result["touch"][:2]) == [3, 3]
+    assert list(result["sharp"][0]) == [0, 1, 2]
+    # conclusions without a slack are never counted as tight
+    assert result["touch"][3] == 0
+
+
+def test_hypothesis_restricts_rows():
+    df = _frame().assign(h=[True, True, True, False])
+    x, y, h = _props()
+
+    result = evaluate_conjectures([Conjecture(h, y == x)], df)
+
+    assert result["valid"][0]
+    assert result["hyp_count"][0] == 3
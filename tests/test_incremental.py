@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+
+from src.nba_synth.incremental import ids_path, synthesize_incremental
+from src.nba_synth.sample_data import make_games
+from src.nba_synth.synthetic import synthesize_quarters
+
+
+def test_appends_only_new_games(tmp_path):
+    games = make_games(60, seed=0)
+    output = str(tmp_path / "synth.csv")
+
+    first = synthesize_incremental(games.head(40), output=output, seed=5)
+    assert len(first) == 40
+    assert os.path.exists(ids_path(output))
+
+    new = synthesize_incremental(games, output=output)
+    assert new["game_id"].tolist() == games["game_id"].tolist()[40:]
+
+    none = synthesize_incremental(games, output=output)
+    assert none.empty
+    assert list(none.columns) == list(new.columns)
+
+    expected = synthesize_quarters(games, seed=5, output=None)
+    pd.testing.assert_frame_equal(pd.read_csv(output), expected,
+                                  check_dtype=False, check_categorical=False)
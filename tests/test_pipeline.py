@@ -0,0 +1,40 @@
+import os
+
+from src.nba_synth import pipeline
+from src.nba_synth.sample_data import make_games
+
+
+def _config(tmp_path, **conjectures):
+    csv = tmp_path / "games.csv"
+    if not csv.exists():
+        make_games(100, seed=0).to_csv(csv, index=False)
+    return {"input": str(csv), "cache_dir": str(tmp_path / "cache"),
+            "features": {"n_clusters": 3},
+            "conjectures": {"targets": ["t"], **conjectures}}
+
+
+def test_failed_targets_are_not_cached(tmp_path, monkeypatch):
+    def failing(df, features, hyps, params):
+        return {"t": TimeoutError("t: no result within 1s")}
+
+    monkeypatch.setattr(pipeline, "_conjectures", failing)
+    log = []
+    first = pipeline.run_pipeline(_config(tmp_path, timeout=1), log=log.append)
+    assert first["conjectures"]["path"] is None
+    assert any("failed: t" in line for line in log)
+
+    monkeypatch.setattr(pipeline, "_conjectures", lambda df, features, hyps, params: {"t": []})
+    second = pipeline.run_pipeline(_config(tmp_path, timeout=1), log=lambda line: None)
+    assert second["hypotheses"]["cached"]
+    assert not second["conjectures"]["cached"]
+    assert os.path.exists(second["conjectures"]["path"])
+    assert second["results"] == {"t": []}
+
+
+def test_runtime_params_do_not_change_keys(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "_conjectures", lambda df, features, hyps, params: {"t": []})
+    first = pipeline.run_pipeline(_config(tmp_path, workers=1, timeout=5), log=lambda line: None)
+    second = pipeline.run_pipeline(_config(tmp_path, workers=4, timeout=None), log=lambda line: None)
+
+    assert second["conjectures"]["key"] == first["conjectures"]["key"]
+    assert second["conjectures"]["cached"]
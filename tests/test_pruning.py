@@ -0,0 +1,16 @@
+import numpy as np
+
+from src.nba_synth.pruning import _independent_columns
+
+
+def test_affine_combinations_are_dropped():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 12))
+    X[:, 5] = X[:, 1] + 2 * X[:, 3] - 4
+    X[:, 9] = X[:, 7] - X[:, 0]
+    Z = X - X.mean(axis=0)
+    Z /= np.linalg.norm(Z, axis=0)
+
+    keep = _independent_columns(Z.T @ Z, tol=1e-6)
+
+    assert np.flatnonzero(~keep).tolist() == [5, 9]
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from src.nba_synth.schema import apply_schema
+
+
+def test_ids_with_missing_values_keep_every_digit():
+    df = pd.DataFrame({
+        "game_id": [22300001.0, np.nan, 22300003.0],
+        "team_id_home": [1610612737.0, 1610612738.0, np.nan],
+        "pts_home": [101.0, np.nan, 99.0],
+    })
+
+    out = apply_schema(df)
+
+    assert out["game_id"].dtype == np.float64
+    assert out["game_id"].iloc[0] == 22300001
+    assert out["team_id_home"].iloc[0] == 1610612737
+    assert out["pts_home"].dtype == np.float32
+
+
+def test_complete_ids_stay_integers():
+    df = pd.DataFrame({"game_id": [22300001, 22300002], "pts_home": [101, 99]})
+
+    out = apply_schema(df)
+
+    assert out["game_id"].dtype == np.int32
+    assert out["pts_home"].dtype == np.int16
+    assert out["game_id"].tolist() == [22300001, 22300002]
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.nba_synth.sample_data import make_games
+from src.nba_synth.sharding import iter_shards, synthesize_sharded
+from src.nba_synth.synthetic import synthesize_quarters
+
+
+def test_season_shards_keep_interleaved_input_order(tmp_path):
+    games = make_games(40, seed=0)
+    games["season_id"] = [22019, 22020] * 20
+    path = tmp_path / "games.csv"
+    games.to_csv(path, index=False)
+
+    shards = list(iter_shards(str(path), partition="season"))
+    assert pd.concat(shards)["game_id"].tolist() == games["game_id"].tolist()
+
+    out = tmp_path / "synth.csv"
+    synthesize_sharded(str(path), str(out), seed=3, partition="season")
+    expected = synthesize_quarters(pd.read_csv(path), seed=3, output=None)
+    pd.testing.assert_frame_equal(pd.read_csv(out), expected.reset_index(drop=True),
+                                  check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("seed", [7, np.random.SeedSequence(7)])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sharded_output_matches_single_process(tmp_path, seed, workers):
+    path = tmp_path / "games.csv"
+    make_games(200, seed=0).to_csv(path, index=False)
+
+    out = tmp_path / "synth.csv"
+    synthesize_sharded(str(path), str(out), seed=seed, workers=workers, chunk_size=50)
+    expected = synthesize_quarters(pd.read_csv(path), seed=seed, output=None)
+    pd.testing.assert_frame_equal(pd.read_csv(out), expected.reset_index(drop=True),
+                                  check_dtype=False, check_categorical=False)
@@ -0,0 +1,13 @@
+import pandas as pd
+
+from src.nba_synth.store import load_dataset
+
+
+def test_read_csv_options_get_their_own_copy(tmp_path):
+    path = tmp_path / "x.csv"
+    pd.DataFrame({"a": [1, 2], "b": [3, 4]}).to_csv(path, index=False)
+    store = str(tmp_path / "st")
+
+    assert load_dataset(str(path), store_dir=store, usecols=["a"]).columns.tolist() == ["a"]
+    assert load_dataset(str(path), store_dir=store).columns.tolist() == ["a", "b"]
+    assert load_dataset(str(path), store_dir=store, usecols=["a"]).columns.tolist() == ["a"]
@@ -0,0 +1,26 @@
+import builtins
+
+from src.nba_synth import telemetry
+
+
+def test_stage_without_resource_module(monkeypatch):
+    real_import = builtins.__import__
+
+    def no_resource(name, *args, **kwargs):
+        if name == "resource":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_resource)
+    telemetry.reset()
+    telemetry.enable()
+    try:
+        with telemetry.stage("load"):
+            pass
+    finally:
+        telemetry.disable()
+
+    record, = telemetry.records
+    assert record["max_rss_bytes"] is None
+    assert telemetry.summary_table().row_count == 1
+    telemetry.reset()
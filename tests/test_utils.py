@@ -0,0 +1,36 @@
+import pandas as pd
+
+from utils import KnowledgeIndex
+
+
+class _Conj:
+    def __init__(self, sharp_instances):
+        self.sharp_instances = sharp_instances
+
+
+def _index():
+    df = pd.DataFrame({"name": ["a", "b", "c"], "p": [True, False, True], "x": [0, 1, 2]})
+    return KnowledgeIndex(df, ["p"], ["x"])
+
+
+def test_common_properties_of_sharp_instances():
+    result = _index().analyze(_Conj({"a", "c"}))
+
+    assert result["common_bool"] == {"p": True}
+    assert result["equality_column"] == "p"
+
+
+def test_no_sharp_instances_have_no_common_booleans():
+    result = _index().analyze(_Conj({"missing"}))
+
+    assert result["common_bool"] == {}
+    assert result["equality_column"] is None
+
+
+def test_duplicate_labels():
+    df = pd.DataFrame({"name": ["a", "a", "c"], "p": [True, True, False], "x": [1, 1, 2]})
+    result = KnowledgeIndex(df, ["p"], ["x"]).analyze(_Conj({"a"}))
+
+    assert result["common_bool"] == {"p": True}
+    assert result["common_numeric"] == {"x": ["all 1"]}
+    assert result["equality_column"] == "p"
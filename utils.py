@@ -4,6 +4,8 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from pyfiglet import Figlet
 import questionary
+import numpy as np
+import pandas as pd
 
 __all__ = [
     'custom_style',
@@ -41,21 +43,125 @@ git_custom_style = Style([
     ('disabled', 'fg:#858585 italic')
 ])
 
+# set-bit count of every byte value, for numpy versions without bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits along the last axis of a packed uint8 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int64)
+
+
+class KnowledgeIndex:
+    """Precomputed lookups over a knowledge table for sharp-instance analysis.
+
+    Boolean columns are stored as packed bitsets of their True and False
+    rows (NaN in neither); numeric columns as zero / non-NaN bitsets plus a
+    dense float matrix. A set of sharp instances becomes
+    a bitset too, so "constant on the sharp set" and "true exactly on the
+    sharp set" are a few bitwise operations over all columns at once.
+    Results are memoized per conjecture.
+    """
+
+    def __init__(self, df: pd.DataFrame, boolean_columns: list, numeric_columns: list):
+        self.df = df
+        self.labels = pd.Index(df['name']) if 'name' in df.columns else df.index
+        self.boolean_columns = [c for c in boolean_columns if c in df.columns]
+        self.numeric_columns = [c for c in numeric_columns if c in df.columns]
+
+        B = df[self.boolean_columns]
+        self.true_bits = np.packbits((B == True).to_numpy(dtype=bool).T, axis=1)
+        self.false_bits = np.packbits((B == False).to_numpy(dtype=bool).T, axis=1)
+        self.true_counts = _popcount(self.true_bits)
+
+        X = df[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.values = X
+        self.nonnan_bits = np.packbits(~np.isnan(X).T, axis=1)
+        self.nonzero_bits = np.packbits((X != 0).T & ~np.isnan(X).T, axis=1)
+        self._memo = {}
+
+    def positions(self, sharp_ids) -> np.ndarray:
+        # isin rather than get_indexer: labels may repeat
+        return np.flatnonzero(self.labels.isin(list(sharp_ids)))
+
+    def bitset(self, positions: np.ndarray) -> np.ndarray:
+        mask = np.zeros(len(self.labels), dtype=bool)
+        mask[positions] = True
+        return np.packbits(mask)
+
+    def common_boolean(self, sharp: np.ndarray) -> dict:
+        """Boolean columns constant on the sharp set, with that value ({} for an empty set)."""
+        if not sharp.any():
+            return {}
+        all_true = ~(sharp & ~self.true_bits).any(axis=1)
+        all_false = ~(sharp & ~self.false_bits).any(axis=1)
+        common = {}
+        for col, t, f in zip(self.boolean_columns, all_true, all_false):
+            if t or f:
+                common[col] = bool(t)
+        return common
+
+    def common_numeric(self, sharp: np.ndarray, positions: np.ndarray) -> dict:
+        """Per numeric column: ["all <v>"] if constant, ["all zero"] if all zero, else []."""
+        nonnan = _popcount(sharp & self.nonnan_bits)
+        all_zero = ~(sharp & self.nonzero_bits).any(axis=1)
+        sub = self.values[positions]
+        lo = np.where(np.isnan(sub), np.inf, sub).min(axis=0, initial=np.inf)
+        hi = np.where(np.isnan(sub), -np.inf, sub).max(axis=0, initial=-np.inf)
+        common = {}
+        for j, col in enumerate(self.numeric_columns):
+            if nonnan[j] > 0 and lo[j] == hi[j]:
+                # report the value with the column's own dtype, as pandas would print it
+                first = positions[~np.isnan(sub[:, j])][0]
+                common[col] = [f"all {self.df[col].iloc[first]}"]
+            else:
+                common[col] = ["all zero"] if all_zero[j] else []
+        return common
+
+    def equality_column(self, sharp: np.ndarray) -> str:
+        """First boolean column that is True on exactly the sharp set, or None."""
+        exact = (self.true_bits == sharp).all(axis=1)
+        hits = np.flatnonzero(exact)
+        return self.boolean_columns[hits[0]] if len(hits) else None
+
+    def analyze(self, conj) -> dict:
+        """Common properties and equality column of a conjecture's sharp instances (memoized)."""
+        key = id(conj)
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] is conj:
+            return cached[1]
+        positions = self.positions(conj.sharp_instances)
+        sharp = self.bitset(positions)
+        result = {
+            "common_bool": self.common_boolean(sharp),
+            "common_numeric": self.common_numeric(sharp, positions),
+            "equality_column": self.equality_column(sharp) if len(positions) else None,
+        }
+        # keep a reference so the id cannot be reused by another object
+        self._memo[key] = (conj, result)
+        return result
+
+    def count_true(self, col: str) -> int:
+        return int(self.true_counts[self.boolean_columns.index(col)])
+
+
 def write_on_the_wall(agent, numerical_columns, target_invariants=None, search=True, console=None):
     """
     Interactively view conjectures for a target invariant.
 
     (docstring omitted for brevity)
     """
+    if console is None:
+        from rich.console import Console
+        console = Console()
+
     conjectures = agent.conjectures
     if not conjectures:
         console.print("[yellow]No conjectures to display.[/yellow] Use the 'Make Conjectures' option to add a new conjecture.")
         return
 
-    if console is None:
-        from rich.console import Console
-        console = Console()
-
     # Display header using Figlet.
     from pyfiglet import Figlet  # ensure Figlet is imported here if not already
     fig = Figlet(font='slant')
@@ -65,12 +171,6 @@ def write_on_the_wall(agent, numerical_columns, target_invariants=None, search=T
     console.print("=" * 80)
 
     # <<< NEW: Define helper functions here (moved up) >>>
-    def get_sharp_subset(df, sharp_ids):
-        if 'name' in df.columns:
-            return df[df['name'].isin(sharp_ids)]
-        else:
-            return df.loc[sharp_ids]
-
     def format_sharp_instances(instances, num_columns=4, indent="    "):
         items = sorted(str(item) for item in instances)
         if not items:
@@ -87,194 +187,164 @@ def write_on_the_wall(agent, numerical_columns, target_invariants=None, search=T
             formatted_rows.append(indent + "   ".join(row_items))
         return "\n".join(formatted_rows)
 
-    def find_common_boolean_properties(df, sharp_ids, boolean_columns):
-        subset = get_sharp_subset(df, sharp_ids)
-        common_props = {}
-        for col in boolean_columns:
-            unique_vals = subset[col].unique()
-            if len(unique_vals) == 1:
-                common_props[col] = unique_vals[0]
-        return common_props
-
-    def find_common_numeric_properties(df, sharp_ids, numeric_columns):
-        subset = get_sharp_subset(df, sharp_ids)
-        common_props = {}
-        for col in numeric_columns:
-            values = subset[col].dropna()
-            props = []
-            if (values == 0).all():
-                props.append("all zero")
-            common_props[col] = props
-        # Check if all properties are the same numeric value.
-        for col in numeric_columns:
-            values = subset[col].dropna()
-            if len(values.unique()) == 1:
-                common_props[col] = [f"all {values.iloc[0]}"]
-        return common_props
     # <<< END OF NEW HELPER FUNCTIONS >>>
 
+    # Bitset index over the knowledge table, built per call and shared by
+    # every conjecture viewed in it, so edits to the table between calls
+    # are always seen.
+    kindex = None
+    if search and hasattr(agent, 'knowledge_table'):
+        kindex = KnowledgeIndex(agent.knowledge_table,
+                                getattr(agent, 'boolean_columns', []),
+                                numerical_columns if hasattr(agent, 'numerical_columns') else [])
+
     # Use all available target invariants if none are provided.
     if target_invariants is None:
         target_invariants = list(agent.conjectures.keys())
 
-    # Prompt for target invariant selection if more than one exists.
-    # Prompt for target invariant selection if more than one exists.
-    if len(target_invariants) > 1:
-        selected_target = select("Select a target invariant:", choices=target_invariants).ask()
-    else:
-        selected_target = target_invariants[0]
-
-
-    # Prompt the user to select a conjecture category.
-    category_choice = select(
-        "Select a conjecture category:",
-        choices=["Equalities", "Upper Bounds", "Lower Bounds", "Exit"],
-        style=custom_style,
-    ).ask()
-    if category_choice.lower().startswith("equal"):
-        category_key = "equals"
-    elif category_choice.lower().startswith("upper"):
-        category_key = "upper"
-    elif category_choice.lower().startswith("lower"):
-        category_key = "lower"
-    elif category_choice.lower().startswith("exit"):
-        return
-    else:
-        console.print("[red]Invalid category selected.[/red]")
-        return
+    while True:
+        # Prompt for target invariant selection if more than one exists.
+        if len(target_invariants) > 1:
+            selected_target = select("Select a target invariant:", choices=target_invariants).ask()
+        else:
+            selected_target = target_invariants[0]
 
-    # Retrieve the list of conjectures for the selected target and category.
-    conj_list = agent.conjectures.get(selected_target, {}).get(category_key, [])
-    if not conj_list:
-        console.print(f"[red]No {category_choice} conjectures available for target invariant {selected_target}.[/red]")
-        return
+        # Prompt the user to select a conjecture category.
+        category_choice = select(
+            "Select a conjecture category:",
+            choices=["Equalities", "Upper Bounds", "Lower Bounds", "Exit"],
+            style=custom_style,
+        ).ask()
+        if category_choice.lower().startswith("equal"):
+            category_key = "equals"
+        elif category_choice.lower().startswith("upper"):
+            category_key = "upper"
+        elif category_choice.lower().startswith("lower"):
+            category_key = "lower"
+        elif category_choice.lower().startswith("exit"):
+            return
+        else:
+            console.print("[red]Invalid category selected.[/red]")
+            return
 
-    # Build a numbered list of conjecture summaries.
-    choices_list = []
-    for i, conj in enumerate(conj_list[:10], start=1):
-        hypothesis = convert_hypothesis(conj.hypothesis)
-        conclusion = conj._set_conclusion()
-        statement = f"For any {hypothesis}, {conclusion}."
-        summary = f"{i}: {statement}"
-        choices_list.append(summary)
-    choices_list.append("Exit")
-
-    # Let the user select a conjecture summary.
-    selected_summary = select("Select a conjecture to view details:", choices=choices_list, style=custom_style).ask()
-    if selected_summary == "Exit":
-        return
+        # Retrieve the list of conjectures for the selected target and category.
+        conj_list = agent.conjectures.get(selected_target, {}).get(category_key, [])
+        if not conj_list:
+            console.print(f"[red]No {category_choice} conjectures available for target invariant {selected_target}.[/red]")
+            return
 
-    try:
-        index = int(selected_summary.split(":")[0]) - 1
-    except (ValueError, IndexError):
-        console.print("[red]Error processing your selection.[/red]")
-        return
-    selected_conj = conj_list[index]
-
-    # --- Build detailed information ---
-    details_lines = []
-    hypothesis = convert_hypothesis(selected_conj.hypothesis)
-    conclusion = selected_conj._set_conclusion()
-
-    # <<< NEW: Compute an equality clause using common boolean properties >>>
-    equality_clause = ""
-    if (search and hasattr(agent, 'knowledge_table') and
-        hasattr(selected_conj, 'sharp_instances') and selected_conj.sharp_instances):
-        # Get the set of IDs (or indices) for the sharp instances.
-        sharp_ids = list(selected_conj.sharp_instances)
-        sharp_set = set(sharp_ids)
-        if hasattr(agent, 'boolean_columns'):
-            # Compute common boolean properties among sharp instances.
-            common_bool_for_statement = find_common_boolean_properties(agent.knowledge_table, sharp_ids, agent.boolean_columns)
-            # For each common boolean property, check if the set of rows in the entire knowledge table
-            # that satisfy the property is exactly equal to the sharp instance set.
-            for bool_key, bool_val in common_bool_for_statement.items():
-                # We typically want to check for the property being True.
-                if bool_val is True:
-                    # Get the indices (or IDs) for which the boolean column is True.
-                    full_set = set(agent.knowledge_table.index[agent.knowledge_table[bool_key]])
-                    if full_set == sharp_set:
-                        equality_clause = f" with equality if and only if {bool_key} is True"
-                        break
-
-    # <<< END OF NEW EQUALITY CLAUSE CODE >>>
-
-    # Now, build the statement including the equality clause.
-    if selected_conj.touch > 0:
-        statement = f"\n For any {hypothesis}, \n  \n        {conclusion}{equality_clause}, \n  \n  and this bound is sharp on at least {selected_conj.touch} simple polytopes. \n"
-    else:
-        statement = f"\n For any {hypothesis}, \n  \n        {conclusion}{equality_clause}. \n"
-
-    details_lines.append(f"[bold magenta]Statement: [bold green]{statement}")
-    details_lines.append(f"[bold magenta]Target Invariant:[/bold magenta] {selected_conj.target}")
-    # other invariants
-    if hasattr(selected_conj, 'keywords') and selected_conj.keywords:
-        for keyword in selected_conj.keywords:
-            keyword = keyword.lower()
-            keyword = keyword_map(keyword)
-            details_lines.append(f"[bold magenta]Keyword Information:[/bold magenta] {keyword}")
-
-    details_lines.append(f"[bold magenta]Bound Type:[/bold magenta] {selected_conj.bound_type}")
-    if hasattr(selected_conj, 'complexity') and selected_conj.complexity is not None:
-        details_lines.append(f"[bold magenta]Complexity:[/bold magenta] {selected_conj.complexity}")
-    if selected_conj.touch > 0:
-        if selected_conj.touch > 1:
-            details_lines.append(f"[bold magenta]Sharp on:[/bold magenta] {selected_conj.touch} objects.")
+        # Build a numbered list of conjecture summaries.
+        choices_list = []
+        for i, conj in enumerate(conj_list[:10], start=1):
+            hypothesis = convert_hypothesis(conj.hypothesis)
+            conclusion = conj._set_conclusion()
+            statement = f"For any {hypothesis}, {conclusion}."
+            summary = f"{i}: {statement}"
+            choices_list.append(summary)
+        choices_list.append("Exit")
+
+        # Let the user select a conjecture summary.
+        selected_summary = select("Select a conjecture to view details:", choices=choices_list, style=custom_style).ask()
+        if selected_summary == "Exit":
+            return
+
+        try:
+            index = int(selected_summary.split(":")[0]) - 1
+        except (ValueError, IndexError):
+            console.print("[red]Error processing your selection.[/red]")
+            return
+        selected_conj = conj_list[index]
+
+        # --- Build detailed information ---
+        details_lines = []
+        hypothesis = convert_hypothesis(selected_conj.hypothesis)
+        conclusion = selected_conj._set_conclusion()
+
+        # <<< NEW: Compute an equality clause using common boolean properties >>>
+        equality_clause = ""
+        analysis = None
+        if kindex is not None and hasattr(selected_conj, 'sharp_instances') and selected_conj.sharp_instances:
+            # Common properties and the iff-equality column, memoized per conjecture.
+            analysis = kindex.analyze(selected_conj)
+            # A boolean column that is True on exactly the sharp instances.
+            if analysis["equality_column"] is not None:
+                equality_clause = f" with equality if and only if {analysis['equality_column']} is True"
+
+        # <<< END OF NEW EQUALITY CLAUSE CODE >>>
+
+        # Now, build the statement including the equality clause.
+        if selected_conj.touch > 0:
+            statement = f"\n For any {hypothesis}, \n  \n        {conclusion}{equality_clause}, \n  \n  and this bound is sharp on at least {selected_conj.touch} simple polytopes. \n"
         else:
-            details_lines.append(f"[bold magenta]Sharp on:[/bold magenta] 1 object.")
-    else:
-        details_lines.append(f"[bold magenta]Inequality is strict.[/bold magenta]")
-
-    # --- (The rest of your code remains unchanged) ---
-    # If sharp instances exist, show them and compute common properties.
-    if hasattr(selected_conj, 'sharp_instances') and selected_conj.sharp_instances:
-        details_lines.append(f"[bold magenta]Sharp Instances:[/bold magenta]")
-        details_lines.append(format_sharp_instances(selected_conj.sharp_instances))
-        if search and hasattr(agent, 'knowledge_table'):
-            sharp_ids = list(selected_conj.sharp_instances)
-            common_bool = {}
-            common_numeric = {}
-            if hasattr(agent, 'boolean_columns'):
-                boolean_columns = agent.boolean_columns
-                common_bool = find_common_boolean_properties(agent.knowledge_table, sharp_ids, boolean_columns)
-            if hasattr(agent, 'numerical_columns'):
-                common_numeric = find_common_numeric_properties(agent.knowledge_table, sharp_ids, numerical_columns)
-            if common_bool or common_numeric:
-                details_lines.append(f"[bold magenta]Common properties among sharp instances:[/bold magenta]")
-                if common_bool:
-                    details_lines.append("[bold magenta]Constant boolean columns:[/bold magenta]")
-                    for col, val in common_bool.items():
-                        details_lines.append(f"   {col} == {val}")
-                if common_numeric:
-                    details_lines.append("[bold magenta]Common numeric properties:[/bold magenta]")
-                    for col, props in common_numeric.items():
-                        if props:
-                            details_lines.append(f"   {col}: {', '.join(props)}")
-                        else:
-                            details_lines.append(f"   {col}: None")
+            statement = f"\n For any {hypothesis}, \n  \n        {conclusion}{equality_clause}. \n"
+
+        details_lines.append(f"[bold magenta]Statement: [bold green]{statement}")
+        details_lines.append(f"[bold magenta]Target Invariant:[/bold magenta] {selected_conj.target}")
+        # other invariants
+        if hasattr(selected_conj, 'keywords') and selected_conj.keywords:
+            for keyword in selected_conj.keywords:
+                keyword = keyword.lower()
+                keyword = keyword_map(keyword)
+                details_lines.append(f"[bold magenta]Keyword Information:[/bold magenta] {keyword}")
+
+        details_lines.append(f"[bold magenta]Bound Type:[/bold magenta] {selected_conj.bound_type}")
+        if hasattr(selected_conj, 'complexity') and selected_conj.complexity is not None:
+            details_lines.append(f"[bold magenta]Complexity:[/bold magenta] {selected_conj.complexity}")
+        if selected_conj.touch > 0:
+            if selected_conj.touch > 1:
+                details_lines.append(f"[bold magenta]Sharp on:[/bold magenta] {selected_conj.touch} objects.")
             else:
-                details_lines.append(f"[bold magenta]No common properties found among sharp instances.[/bold magenta]")
-
-    # Optionally, include percentage info from the knowledge table.
-    if search and hasattr(agent, 'knowledge_table') and selected_conj.hypothesis in agent.knowledge_table.columns:
-        hyp_df = agent.knowledge_table[agent.knowledge_table[selected_conj.hypothesis] == True]
-        total_hyp = len(hyp_df)
-        if total_hyp > 0:
-            percent_sharp = 100 * selected_conj.touch / total_hyp
-            details_lines.append(f"[bold magenta]Percentage of hypothesis objects that are sharp:[/bold magenta] {percent_sharp:.1f}%")
+                details_lines.append(f"[bold magenta]Sharp on:[/bold magenta] 1 object.")
         else:
-            details_lines.append(f"[bold magenta]No objects satisfy the hypothesis.[/bold magenta]")
+            details_lines.append(f"[bold magenta]Inequality is strict.[/bold magenta]")
+
+        # --- (The rest of your code remains unchanged) ---
+        # If sharp instances exist, show them and compute common properties.
+        if hasattr(selected_conj, 'sharp_instances') and selected_conj.sharp_instances:
+            details_lines.append(f"[bold magenta]Sharp Instances:[/bold magenta]")
+            details_lines.append(format_sharp_instances(selected_conj.sharp_instances))
+            if analysis is not None:
+                common_bool = analysis["common_bool"]
+                common_numeric = analysis["common_numeric"]
+                if common_bool or common_numeric:
+                    details_lines.append(f"[bold magenta]Common properties among sharp instances:[/bold magenta]")
+                    if common_bool:
+                        details_lines.append("[bold magenta]Constant boolean columns:[/bold magenta]")
+                        for col, val in common_bool.items():
+                            details_lines.append(f"   {col} == {val}")
+                    if common_numeric:
+                        details_lines.append("[bold magenta]Common numeric properties:[/bold magenta]")
+                        for col, props in common_numeric.items():
+                            if props:
+                                details_lines.append(f"   {col}: {', '.join(props)}")
+                            else:
+                                details_lines.append(f"   {col}: None")
+                else:
+                    details_lines.append(f"[bold magenta]No common properties found among sharp instances.[/bold magenta]")
+
+        # Optionally, include percentage info from the knowledge table.
+        if search and hasattr(agent, 'knowledge_table') and selected_conj.hypothesis in agent.knowledge_table.columns:
+            if selected_conj.hypothesis in kindex.boolean_columns:
+                total_hyp = kindex.count_true(selected_conj.hypothesis)
+            else:
+                total_hyp = int((agent.knowledge_table[selected_conj.hypothesis] == True).sum())
+            if total_hyp > 0:
+                percent_sharp = 100 * selected_conj.touch / total_hyp
+                details_lines.append(f"[bold magenta]Percentage of hypothesis objects that are sharp:[/bold magenta] {percent_sharp:.1f}%")
+            else:
+                details_lines.append(f"[bold magenta]No objects satisfy the hypothesis.[/bold magenta]")
 
-    details_text = "\n".join(details_lines)
+        details_text = "\n".join(details_lines)
 
-    # Display the details in a Rich Panel.
-    from rich.panel import Panel  # ensure Panel is imported if needed
-    panel = Panel(details_text,
-                  title=f"[bold magenta]{category_choice} Conjecture Details[/bold magenta]",
-                  style="cyan")
-    console.print(panel)
+        # Display the details in a Rich Panel.
+        from rich.panel import Panel  # ensure Panel is imported if needed
+        panel = Panel(details_text,
+                      title=f"[bold magenta]{category_choice} Conjecture Details[/bold magenta]",
+                      style="cyan")
+        console.print(panel)
 
-    # Wait for the user and then return to the conjecture menu.
-    from rich.prompt import Prompt  # ensure Prompt is imported if needed
-    Prompt.ask("Press Enter to return to the conjecture menu")
-    write_on_the_wall(agent, numerical_columns, target_invariants=[selected_target], search=search, console=console)
+        # Wait for the user and then return to the conjecture menu.
+        from rich.prompt import Prompt  # ensure Prompt is imported if needed
+        Prompt.ask("Press Enter to return to the conjecture menu")
+        # Return to the conjecture menu for the same target.
+        target_invariants = [selected_target]